@@ -10,11 +10,13 @@ setup(
         "requests",
         "folium",
         "python-dotenv",
+        "cachetools",
+        "numpy",
     ],
     entry_points={
         "console_scripts": [
             "shroomie=shroomie.cli.main:main",
         ],
     },
-    python_requires=">=3.6",
+    python_requires=">=3.10",
 )
\ No newline at end of file
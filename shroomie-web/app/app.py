@@ -1,140 +1,260 @@
 #!/usr/bin/env python3
 import os
-from flask import Flask, render_template, request, jsonify
-import sys
+from flask import Flask, Blueprint, render_template, request, jsonify, Response, stream_with_context
 import re
-from shroomie.cli.main import main as shroomie_main
-from shroomie.cli.cli_parser import CliParser
-from io import StringIO
+import threading
+import jinja2
+import gzip
+import zlib
+import cachetools
+import folium
+from folium.plugins import FastMarkerCluster, HeatMap
+import numpy as np
+from shroomie.cli.main import run as run_shroomie
 import json
-import argparse
 from shroomie.utils.map_generator import MapGenerator
 from shroomie.utils.grid_utils import GridUtils
 from shroomie.apis.soil_apis import SoilAPI
-from shroomie.apis.location_apis import LocationAPI
+from shroomie.apis.location_apis import LocationAPI, ElevationAPI
 from shroomie.apis.forest_apis import ForestAPI
 from shroomie.apis.weather_apis import WeatherAPI
 from shroomie.utils.prompt_generator import PromptGenerator
+from shroomie.utils.disk_cache import DiskCache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import logging
+import hashlib
+
+# orjson serializes large nested dicts several times faster than the stdlib
+# json module; fall back to stdlib when it isn't installed
+try:
+    import orjson
+
+    def json_dumps_bytes(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    def json_dumps_bytes(obj):
+        return json.dumps(obj).encode('utf-8')
+
+# Module logger: the logging machinery is thread-safe, unlike ad-hoc
+# stdout writes interleaving across worker threads
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
-# Custom ArgumentParser that doesn't exit on error
-class WebArgumentParser(argparse.ArgumentParser):
-    def exit(self, status=0, message=None):
-        if message:
-            self._exit_message = message
-        raise Exception(message)
-
-    def error(self, message):
-        self.exit(2, message)
-
-# Override the CliParser's create_parser method
-def create_web_parser():
-    parser = WebArgumentParser(description="Query environmental APIs and generate LLM prompts")
-    
-    # Coordinates and location
-    location_group = parser.add_argument_group("Location Options")
-    location_group.add_argument("--lat", type=float, help="Latitude")
-    location_group.add_argument("--lon", type=float, help="Longitude")
-    location_group.add_argument("--location", type=str, help="Location name to geocode")
-    
-    # Other arguments as needed for the web interface
-    parser.add_argument("--prompt", action="store_true", help="Generate LLM prompt")
-    parser.add_argument("--grid", action="store_true", help="Generate a grid of points")
-    parser.add_argument("--grid-size", type=int, default=3, help="Size of the grid (e.g., 3 for a 3x3 grid)")
-    parser.add_argument("--grid-distance", type=float, default=1.0, help="Distance between grid points in miles")
-    
-    return parser
-
-# Cache for API results to avoid redundant API calls
-api_cache = {}
-
-# Capture stdout when running the Shroomie CLI
-def run_shroomie_with_args(args_dict):
-    # Prepare arguments
-    sys.argv = ['shroomie']
-    for key, value in args_dict.items():
-        if value is not None:
-            if isinstance(value, bool) and value is True:
-                sys.argv.append(f"--{key}")
-            elif not isinstance(value, bool):
-                sys.argv.append(f"--{key}")
-                sys.argv.append(str(value))
-    
-    # Create a cache key based on the arguments
-    # This allows us to cache results for identical requests
-    cache_key = str(sorted(args_dict.items()))
-    
+# All routes live on a single shared blueprint so another entry point (or a
+# future API version) can mount them without redefining handlers
+bp = Blueprint('shroomie', __name__)
+
+# Cache for analysis results to avoid redundant API calls. Bounded with a
+# TTL so a long-running worker serving many distinct coordinates doesn't
+# accumulate every result dict forever, and so stale weather data ages out.
+api_cache = cachetools.TTLCache(maxsize=128, ttl=3600)
+api_cache_lock = threading.Lock()
+
+# Second cache level persisted to SQLite, so results survive worker restarts
+# and redeploys; path is overridable for containers with a mounted volume
+disk_cache = DiskCache(
+    os.environ.get('SHROOMIE_CACHE_PATH', os.path.join(os.path.dirname(__file__), 'shroomie_cache.sqlite3')),
+    ttl=3600
+)
+
+# Persistent worker pool for per-point suitability scoring: creating a pool
+# per request would pay thread startup on every grid analysis
+scoring_executor = ThreadPoolExecutor(max_workers=8)
+
+def run_analysis(lat, lon, is_grid=False, grid_size=3, grid_distance=1.0):
+    """Run a Shroomie analysis in-process, caching results for identical requests."""
+    # Snap coordinates to the same ~11 m cell grid the API caches use, so
+    # near-duplicate lookups (map clicks, float noise) coalesce onto one
+    # cached analysis
+    cache_key = (round(lat, 4), round(lon, 4), is_grid, grid_size, grid_distance)
+
     # Check if we have cached results for this exact query
-    if cache_key in api_cache:
-        return api_cache[cache_key]
-    
-    # Capture stdout
-    original_stdout = sys.stdout
-    sys.stdout = mystdout = StringIO()
-    
+    with api_cache_lock:
+        if cache_key in api_cache:
+            return api_cache[cache_key]
+
+    # Fall back to the persistent cache (results from before a restart).
+    # orjson builds the serialized key noticeably faster than stdlib json.
+    disk_key = json_dumps_bytes(cache_key).decode('utf-8')
+    result = disk_cache.get(disk_key)
+    if result is not None:
+        with api_cache_lock:
+            api_cache[cache_key] = result
+        return result
+
     try:
-        # Apply monkey patching to add caching to API calls
-        # This helps speed up repeated API calls within the same session
-        
-        # Cache the original methods
-        original_soil_properties = SoilAPI.get_soil_properties
-        original_forest_cover = ForestAPI.get_forest_cover
-        original_weather = WeatherAPI.get_weather_history
-        
-        # Create local caches
-        soil_cache = {}
-        forest_cache = {}
-        weather_cache = {}
-        
-        # Create cached versions of slow API methods
-        def cached_soil_properties(lat, lon, *args, **kwargs):
-            cache_key = f"{lat}_{lon}"
-            if cache_key not in soil_cache:
-                soil_cache[cache_key] = original_soil_properties(lat, lon, *args, **kwargs)
-            return soil_cache[cache_key]
-        
-        def cached_forest_cover(lat, lon, *args, **kwargs):
-            cache_key = f"{lat}_{lon}"
-            if cache_key not in forest_cache:
-                forest_cache[cache_key] = original_forest_cover(lat, lon, *args, **kwargs)
-            return forest_cache[cache_key]
-        
-        def cached_weather_history(lat, lon, *args, **kwargs):
-            cache_key = f"{lat}_{lon}"
-            if cache_key not in weather_cache:
-                weather_cache[cache_key] = original_weather(lat, lon, *args, **kwargs)
-            return weather_cache[cache_key]
-        
-        # Apply the monkey patches
-        SoilAPI.get_soil_properties = cached_soil_properties
-        ForestAPI.get_forest_cover = cached_forest_cover
-        WeatherAPI.get_weather_history = cached_weather_history
-        
-        # Run the main function
-        shroomie_main()
-        output = mystdout.getvalue()
-        
-        # Cache the result
-        api_cache[cache_key] = output
-        
-        # Restore original methods
-        SoilAPI.get_soil_properties = original_soil_properties
-        ForestAPI.get_forest_cover = original_forest_cover
-        WeatherAPI.get_weather_history = original_weather
-        
+        result = run_shroomie(
+            lat, lon,
+            grid=is_grid,
+            grid_size=grid_size,
+            grid_distance=grid_distance,
+            prompt=True
+        )
+        with api_cache_lock:
+            api_cache[cache_key] = result
+        disk_cache.set(disk_key, result)
     except Exception as e:
-        output = f"Error: {str(e)}"
-    finally:
-        # Reset stdout
-        sys.stdout = original_stdout
-    
-    return output
-
-@app.route('/', methods=['GET'])
+        result = {"output": f"Error: {str(e)}"}
+
+    return result
+
+# Responses below this size aren't worth the compression overhead
+MIN_COMPRESS_SIZE = 1024
+
+_COMPRESSIBLE_TYPES = ('application/json', 'application/javascript')
+
+# Brotli compresses the JSON/map payloads noticeably better than gzip;
+# used when both the client and the optional brotli package support it
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+@app.after_request
+def compress_response(response):
+    """Gzip JSON/HTML responses in-process when the client supports it.
+
+    The /analyze payload embeds full folium map HTML and is highly
+    repetitive, so compressing it cuts transfer size by an order of
+    magnitude. Streamed responses are compressed chunk by chunk to keep
+    incremental delivery."""
+    accept_encoding = request.headers.get('Accept-Encoding', '').lower()
+    use_brotli = brotli is not None and 'br' in accept_encoding
+    if not use_brotli and 'gzip' not in accept_encoding:
+        return response
+    if not (200 <= response.status_code < 300):
+        return response
+    if 'Content-Encoding' in response.headers:
+        return response
+    mimetype = response.mimetype or ''
+    if not (mimetype.startswith('text/') or mimetype in _COMPRESSIBLE_TYPES):
+        return response
+    if mimetype == 'text/event-stream':
+        # The compressor would buffer small SSE events instead of delivering
+        # them as they happen
+        return response
+
+    response.headers.add('Vary', 'Accept-Encoding')
+
+    if response.is_streamed or response.direct_passthrough:
+        # Compress chunk by chunk so streamed bodies stay incremental
+        def compress_stream(chunks):
+            if use_brotli:
+                compressor = brotli.Compressor()
+                compress = compressor.process
+                flush = compressor.finish
+            else:
+                compressor = zlib.compressobj(wbits=31)  # wbits=31 -> gzip container
+                compress = compressor.compress
+                flush = compressor.flush
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                data = compress(chunk)
+                if data:
+                    yield data
+            yield flush()
+
+        response.response = compress_stream(response.response)
+        response.headers['Content-Encoding'] = 'br' if use_brotli else 'gzip'
+        response.headers.pop('Content-Length', None)
+        return response
+
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return response
+
+    if use_brotli:
+        response.set_data(brotli.compress(data))
+        response.headers['Content-Encoding'] = 'br'
+    else:
+        response.set_data(gzip.compress(data))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+@bp.route('/', methods=['GET'])
 def index():
     return render_template('index.html')
 
+# Precompiled extraction patterns: the single-line fields are combined into
+# one alternation so the output text is scanned once instead of once per
+# field, and the section/bullet patterns are compiled once at import.
+_FIELD_PATTERN = re.compile(
+    r"Location: (?P<location_name>.+?)(?:\n|$)"
+    r"|Elevation.*?: (?P<elevation>\d+(?:\.\d+)?)"
+    r"|Tree Cover: (?P<tree_cover>\d+(?:\.\d+)?)%"
+    r"|Ecoregion: (?P<ecoregion>.+?)(?:\n|$)"
+    r"|Forest Type: (?P<forest_type>.+?)(?:\n|$)"
+    r"|Primary Soil Type.*?: (?P<soil_type>.+?)(?:\n|$)"
+)
+# First characters that continue a section, per section. These mirror the
+# old regex terminators exactly: the *-bulleted sections ended at \n[^*\s]
+# (so a non-indented "- ..." header line like "- Common Tree Species:" ends
+# them), while the mushroom section ended at \n[^-\s].
+_SECTION_CONTINUATION = {
+    "trees": "* \t",
+    "mushrooms": "- \t",
+    "soil": "* \t",
+}
+
+def _extract_bullet_sections(output_text):
+    """Collect the bullet-list sections in one pass over the output lines.
+
+    Walks the text once with str.startswith checks instead of DOTALL regex
+    scans per section. A section ends at a blank line or a line whose first
+    character isn't in its continuation set, mirroring the old regex
+    terminators.
+
+    Returns:
+        tuple: (dominant_trees, mushroom_types, soil_properties)
+    """
+    trees = []
+    mushrooms = []
+    soil_properties = {}
+    section = None
+
+    for line in output_text.splitlines():
+        stripped = line.strip()
+
+        # Section headers (checked first: a header also ends the previous
+        # section). The forest module's "(estimated):" variant is excluded,
+        # as it was by the old anchored pattern.
+        if stripped.endswith("Dominant Tree Species:"):
+            section = "trees"
+            continue
+        if stripped == "Mushroom-Tree Associations:":
+            section = "mushrooms"
+            continue
+        if stripped.endswith("Soil Properties:"):
+            section = "soil"
+            continue
+
+        if section is None:
+            continue
+
+        # Terminators: blank line, or a first character outside the
+        # section's continuation set
+        if not stripped or line[0] not in _SECTION_CONTINUATION[section]:
+            section = None
+            continue
+
+        if section == "trees" and stripped.startswith("*"):
+            trees.append(stripped[1:].strip())
+        elif section == "mushrooms" and stripped.startswith("-"):
+            entry = stripped[1:].strip()
+            if ":" in entry:
+                mushrooms.extend(m.strip() for m in entry.split(":", 1)[1].split(","))
+        elif section == "soil" and stripped.startswith("*"):
+            prop = stripped[1:].strip()
+            if ":" in prop:
+                name, value = prop.split(":", 1)
+                soil_properties[name.strip()] = value.strip()
+            else:
+                soil_properties[prop] = "No specific value"
+
+    return trees, mushrooms, soil_properties
+
 def extract_data_from_output(output_text):
     """
     Extract relevant data from the Shroomie output text to enhance map markers
@@ -150,69 +270,35 @@ def extract_data_from_output(output_text):
         "soil_type": None,
         "soil_properties": {}
     }
-    
+
     try:
-        # Extract location name
-        location_match = re.search(r"Location: (.+?)(?:\n|$)", output_text)
-        if location_match:
-            data["location_name"] = location_match.group(1).strip()
-        
-        # Extract elevation
-        elevation_match = re.search(r"Elevation.*?: (\d+(?:\.\d+)?)", output_text)
-        if elevation_match:
-            data["elevation"] = float(elevation_match.group(1))
-        
-        # Extract tree cover
-        tree_cover_match = re.search(r"Tree Cover: (\d+(?:\.\d+)?)%", output_text)
-        if tree_cover_match:
-            data["tree_cover"] = float(tree_cover_match.group(1))
-        
-        # Extract ecoregion
-        ecoregion_match = re.search(r"Ecoregion: (.+?)(?:\n|$)", output_text)
-        if ecoregion_match:
-            data["ecoregion"] = ecoregion_match.group(1).strip()
-        
-        # Extract forest type
-        forest_type_match = re.search(r"Forest Type: (.+?)(?:\n|$)", output_text)
-        if forest_type_match:
-            data["forest_type"] = forest_type_match.group(1).strip()
-        
-        # Extract dominant tree species
-        tree_section = re.search(r"Dominant Tree Species:(.*?)(?:\n\n|\n[^*\s])", output_text, re.DOTALL)
-        if tree_section:
-            trees = re.findall(r"\*\s+(.+?)(?:\n|$)", tree_section.group(1))
-            data["dominant_trees"] = [tree.strip() for tree in trees]
-        
-        # Extract mushroom associations
-        mushroom_section = re.search(r"Mushroom-Tree Associations:(.*?)(?:\n\n|\n[^-\s])", output_text, re.DOTALL)
-        if mushroom_section:
-            mushroom_lines = re.findall(r"-\s+.+?:\s+(.+?)(?:\n|$)", mushroom_section.group(1))
-            for line in mushroom_lines:
-                mushrooms = [m.strip() for m in line.split(',')]
-                data["mushroom_types"].extend(mushrooms)
-            # Remove duplicates while preserving order
-            seen = set()
-            data["mushroom_types"] = [m for m in data["mushroom_types"] if not (m in seen or seen.add(m))]
-        
-        # Extract soil type
-        soil_type_match = re.search(r"Primary Soil Type.*?: (.+?)(?:\n|$)", output_text)
-        if soil_type_match:
-            data["soil_type"] = soil_type_match.group(1).strip()
-        
-        # Extract soil properties
-        soil_section = re.search(r"Soil Properties:(.*?)(?:\n\n|\n[^*\s])", output_text, re.DOTALL)
-        if soil_section:
-            properties = re.findall(r"\*\s+(.+?)(?:\n|$)", soil_section.group(1))
-            for prop in properties:
-                if ':' in prop:
-                    name, value = prop.split(':', 1)
-                    data["soil_properties"][name.strip()] = value.strip()
-                else:
-                    data["soil_properties"][prop.strip()] = "No specific value"
-        
+        # Extract the single-line fields in one pass, keeping the first
+        # occurrence of each (matching the old per-field re.search behavior)
+        for match in _FIELD_PATTERN.finditer(output_text):
+            field = match.lastgroup
+            if data[field] is not None and field != "location_name":
+                continue
+            if field == "location_name" and data[field] != "Unknown Location":
+                continue
+
+            value = match.group(field).strip()
+            if field in ("elevation", "tree_cover"):
+                data[field] = float(value)
+            else:
+                data[field] = value
+
+        # Extract the bullet-list sections in one pass over the lines
+        trees, mushrooms, soil_properties = _extract_bullet_sections(output_text)
+        data["dominant_trees"] = trees
+        data["soil_properties"] = soil_properties
+
+        # Remove duplicate mushrooms while preserving order
+        seen = set()
+        data["mushroom_types"] = [m for m in mushrooms if not (m in seen or seen.add(m))]
+
         return data
     except Exception as e:
-        print(f"Error extracting data from output: {str(e)}")
+        logger.warning("Error extracting data from output: %s", e)
         return data
 
 def calculate_species_suitability(lat, lon, species_list, environmental_data=None):
@@ -236,11 +322,12 @@ def calculate_species_suitability(lat, lon, species_list, environmental_data=Non
         from shroomie.apis.forest_apis import ForestAPI
         from shroomie.apis.weather_apis import WeatherAPI
 
-        # Gather environmental data if not provided
-        if environmental_data is None:
-            environmental_data = {}
+        # Gather whichever environmental factors the caller didn't
+        # prefetch (e.g. batch elevation lookups for grid scans)
+        environmental_data = dict(environmental_data) if environmental_data else {}
 
-            # Get soil pH (from soil properties)
+        # Get soil pH (from soil properties)
+        if 'soil_ph' not in environmental_data:
             try:
                 soil_props = SoilAPI.get_soil_properties(lat, lon)
                 if soil_props and not soil_props.get('error'):
@@ -255,27 +342,32 @@ def calculate_species_suitability(lat, lon, species_list, environmental_data=Non
                                     environmental_data['soil_ph'] = ph_value / 10.0  # Convert from pH*10 to pH
                                     break
             except Exception as e:
-                print(f"Error getting soil pH: {e}")
+                logger.warning("Error getting soil pH: %s", e)
 
-            # Get elevation
+        # Get elevation
+        if 'elevation' not in environmental_data:
             try:
                 elev_data = ElevationAPI.get_elevation_data(lat, lon)
                 if elev_data and not elev_data.get('error'):
                     environmental_data['elevation'] = elev_data.get('elevation', 0)
             except Exception as e:
-                print(f"Error getting elevation: {e}")
+                logger.warning("Error getting elevation: %s", e)
 
-            # Get tree species
+        # Get tree species
+        if 'dominant_trees' not in environmental_data:
             try:
-                tree_data = ForestAPI.get_tree_species(lat, lon)
+                tree_data = ForestAPI.get_tree_species(
+                    lat, lon, elevation=environmental_data.get('elevation')
+                )
                 if tree_data and not tree_data.get('error'):
                     dominant = tree_data.get('dominant_species', [])
                     environmental_data['dominant_trees'] = dominant
             except Exception as e:
-                print(f"Error getting tree species: {e}")
+                logger.warning("Error getting tree species: %s", e)
                 environmental_data['dominant_trees'] = []
 
-            # Get weather data
+        # Get weather data
+        if 'temperature_mean' not in environmental_data:
             try:
                 weather_data = WeatherAPI.get_weather_history(lat, lon, months=1)
                 if weather_data and not weather_data.get('error'):
@@ -285,14 +377,14 @@ def calculate_species_suitability(lat, lon, species_list, environmental_data=Non
                         environmental_data['temperature_mean'] = latest_month.get('temp_mean', 15)
                         environmental_data['precipitation'] = latest_month.get('precip_sum', 50)
             except Exception as e:
-                print(f"Error getting weather: {e}")
+                logger.warning("Error getting weather: %s", e)
 
         # Calculate scores for each species
         species_db = SpeciesDatabase()
         results = {}
 
-        print(f"🍄 Calculating scores for species: {species_list}")
-        print(f"📊 Environmental data available: {list(environmental_data.keys())}")
+        logger.info("Calculating scores for species: %s", species_list)
+        logger.info("Environmental data available: %s", list(environmental_data.keys()))
 
         for species_id in species_list:
             try:
@@ -306,13 +398,11 @@ def calculate_species_suitability(lat, lon, species_list, environmental_data=Non
                         'factor_scores': score_result['factor_scores'],
                         'details': score_result.get('details', {})
                     }
-                    print(f"✓ Scored {species_data.get('common_name')}: {score_result['overall_score']}")
+                    logger.info("Scored %s: %s", species_data.get('common_name'), score_result['overall_score'])
                 else:
-                    print(f"✗ Species not found: {species_id}")
+                    logger.warning("Species not found: %s", species_id)
             except Exception as e:
-                print(f"✗ Error scoring {species_id}: {str(e)}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("Error scoring %s", species_id)
 
         # Sort by score descending
         sorted_results = dict(sorted(results.items(), key=lambda x: x[1]['score'], reverse=True))
@@ -329,6 +419,17 @@ def calculate_species_suitability(lat, lon, species_list, environmental_data=Non
             'environmental_data': {}
         }
 
+def prefetch_grid_elevations(coordinates):
+    """Fetch elevations for all grid points in one batched query.
+
+    Returns a list aligned with coordinates, or None when the batch lookup
+    fails (per-point scoring then falls back to individual lookups)."""
+    batch = ElevationAPI.get_elevation_batch(coordinates)
+    if 'error' in batch:
+        logger.warning("Batch elevation lookup failed: %s", batch['error'])
+        return None
+    return batch['elevations']
+
 def find_best_spots(center_lat, center_lon, radius_miles, species_id, min_score=60, top_n=10):
     """
     Scan an area to find the best locations for a mushroom species.
@@ -349,7 +450,7 @@ def find_best_spots(center_lat, center_lon, radius_miles, species_id, min_score=
         from shroomie.utils.grid_utils import GridUtils
         from shroomie.data.species_loader import SpeciesDatabase
 
-        print(f"🔍 Finding best spots for {species_id} within {radius_miles} miles...")
+        logger.info("Finding best spots for %s within %s miles...", species_id, radius_miles)
 
         # Calculate grid size based on radius
         # Use smaller grid spacing for smaller radius, larger for bigger radius
@@ -368,21 +469,33 @@ def find_best_spots(center_lat, center_lon, radius_miles, species_id, min_score=
             center_lat, center_lon, grid_size, grid_distance
         )
 
-        print(f"📍 Scanning {len(coordinates)} locations...")
+        logger.info("Scanning %d locations...", len(coordinates))
 
-        # Calculate suitability score for each point
+        # One batched elevation query covers the scan area
+        elevations = prefetch_grid_elevations(coordinates)
+
+        # Calculate suitability scores for all points in parallel on the
+        # persistent pool: each point is dominated by blocking API calls
         results = []
-        for idx, (lat, lon) in enumerate(coordinates):
+        futures = {
+            scoring_executor.submit(
+                calculate_species_suitability, point_lat, point_lon, [species_id],
+                {'elevation': elevations[idx]} if elevations else None
+            ): (point_lat, point_lon)
+            for idx, (point_lat, point_lon) in enumerate(coordinates)
+        }
+        for idx, future in enumerate(as_completed(futures)):
+            point_lat, point_lon = futures[future]
             try:
-                scoring_result = calculate_species_suitability(lat, lon, [species_id])
+                scoring_result = future.result()
 
                 if scoring_result and scoring_result.get('species_scores'):
                     species_data = scoring_result['species_scores'].get(species_id)
 
                     if species_data and species_data['score'] >= min_score:
                         results.append({
-                            'lat': lat,
-                            'lon': lon,
+                            'lat': point_lat,
+                            'lon': point_lon,
                             'score': species_data['score'],
                             'factor_scores': species_data.get('factor_scores', {}),
                             'common_name': species_data.get('common_name', species_id)
@@ -390,7 +503,7 @@ def find_best_spots(center_lat, center_lon, radius_miles, species_id, min_score=
 
                 # Progress indicator every 25 points
                 if (idx + 1) % 25 == 0:
-                    print(f"  ... processed {idx + 1}/{len(coordinates)} points")
+                    logger.info("... processed %d/%d points", idx + 1, len(coordinates))
 
             except Exception as e:
                 # Skip failed points
@@ -402,7 +515,7 @@ def find_best_spots(center_lat, center_lon, radius_miles, species_id, min_score=
         # Return top N
         top_results = results[:top_n]
 
-        print(f"✓ Found {len(results)} suitable locations (showing top {len(top_results)})")
+        logger.info("Found %d suitable locations (showing top %d)", len(results), len(top_results))
 
         # Add ranking
         for rank, result in enumerate(top_results, 1):
@@ -411,23 +524,193 @@ def find_best_spots(center_lat, center_lon, radius_miles, species_id, min_score=
         return top_results
 
     except Exception as e:
-        print(f"✗ Error in find_best_spots: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in find_best_spots")
         return []
 
-def generate_map_html(lat, lon, zoom=10, include_soil_data=None, is_grid=False, grid_size=3, grid_distance=1.0, enhanced_data=None, species_scores=None):
+# JS callback for FastMarkerCluster grid markers, defined once at module
+# scope: row[2] flags the center point, which gets a larger red dot
+GRID_CLUSTER_CALLBACK = """
+    function (row) {
+        var icon, size;
+        if (row[2] === 1) {  // Center point
+            icon = L.divIcon({
+                html: '<div style="background-color: #e74c3c; width: 10px; height: 10px; border-radius: 50%;"></div>',
+                className: 'marker-cluster',
+                iconSize: L.point(10, 10)
+            });
+        } else {
+            icon = L.divIcon({
+                html: '<div style="background-color: #3498db; width: 6px; height: 6px; border-radius: 50%;"></div>',
+                className: 'marker-cluster',
+                iconSize: L.point(6, 6)
+            });
+        }
+        return L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    };
+"""
+
+# Precompiled popup template for the single-point enhanced marker; compiled
+# once at module scope with autoescape for the extracted text fields
+ENHANCED_POPUP_TEMPLATE = jinja2.Template("""
+<div style="font-family: Arial, sans-serif; max-width: 400px;">
+    <h4 style="color: #336699; margin-bottom: 8px; border-bottom: 1px solid #ddd; padding-bottom: 5px;">
+        Location Analysis
+    </h4>
+
+    <div style="margin-bottom: 10px;">
+        <strong>{{ location_name }}</strong><br>
+        <span style="color: #666;">Coordinates: {{ "%.5f"|format(lat) }}, {{ "%.5f"|format(lon) }}</span>
+    </div>
+    {%- if elevation %}
+    <div style="margin-bottom: 10px;">
+        <strong>Elevation:</strong> {{ elevation }} meters
+    </div>
+    {%- endif %}
+    {%- if tree_cover %}
+    <div style="margin-bottom: 10px;">
+        <strong>Tree Cover:</strong> {{ tree_cover }}%
+    </div>
+    {%- endif %}
+    {%- if ecoregion or forest_type %}
+    <div style="margin-bottom: 10px;">
+        {%- if ecoregion %}<strong>Ecoregion:</strong> {{ ecoregion }}<br>{% endif %}
+        {%- if forest_type %}<strong>Forest Type:</strong> {{ forest_type }}{% endif %}
+    </div>
+    {%- endif %}
+    {%- if dominant_trees %}
+    <div style="margin-bottom: 10px;">
+        <strong>Dominant Trees:</strong><br>
+        <ul style="margin: 5px 0 5px 20px; padding: 0;">
+        {%- for tree in dominant_trees %}
+            <li>{{ tree }}</li>
+        {%- endfor %}
+        </ul>
+    </div>
+    {%- endif %}
+    {%- if mushroom_types %}
+    <div style="margin-bottom: 10px;">
+        <strong>Potential Mushroom Types:</strong><br>
+        <ul style="margin: 5px 0 5px 20px; padding: 0;">
+        {%- for mushroom in mushroom_types %}
+            <li>{{ mushroom }}</li>
+        {%- endfor %}
+        </ul>
+    </div>
+    {%- endif %}
+    {%- if soil_type %}
+    <div style="margin-bottom: 10px;">
+        <strong>Primary Soil Type:</strong> {{ soil_type }}
+    </div>
+    {%- endif %}
+    {%- if soil_properties %}
+    <div style="margin-bottom: 10px;">
+        <strong>Soil Properties:</strong><br>
+        <ul style="margin: 5px 0 5px 20px; padding: 0;">
+        {%- for name, value in soil_properties %}
+            <li>{{ name }}: {{ value }}</li>
+        {%- endfor %}
+        </ul>
+    </div>
+    {%- endif %}
+</div>
+""", autoescape=True)
+
+# Precompiled popup template for grid-point species scores: compiling once at
+# module scope avoids re-parsing the template string for every grid point.
+GRID_POPUP_TEMPLATE = jinja2.Template("""
+<div style="font-family: Arial; min-width: 220px;">
+    <h5 style="margin: 0 0 10px 0; border-bottom: 1px solid #ddd; padding-bottom: 5px;">
+        Grid Point: {{ "%.4f"|format(lat) }}, {{ "%.4f"|format(lon) }}
+    </h5>
+    <p style="margin: 5px 0;"><strong>Species Suitability Scores:</strong></p>
+    <table style="width: 100%; font-size: 12px;">
+    {%- for s in species %}
+        <tr>
+            <td style="padding: 3px;">{{ s.name }}:</td>
+            <td style="padding: 3px; text-align: right;">
+                <span style="background-color: {{ s.color }}; padding: 2px 6px; border-radius: 3px; color: white; font-weight: bold;">
+                    {{ "%.1f"|format(s.score) }}
+                </span>
+            </td>
+        </tr>
+    {%- endfor %}
+    </table>
+</div>
+""", autoescape=True)
+
+# Rendered maps are also stored as content-addressed assets so responses can
+# reference them by URL instead of (eventually, instead of only) inlining
+# the full HTML into the JSON payload
+map_asset_cache = cachetools.TTLCache(maxsize=256, ttl=3600)
+map_asset_lock = threading.Lock()
+
+def store_map_asset(map_html):
+    """Store rendered map HTML and return its content-addressed id."""
+    map_id = hashlib.sha1(map_html.encode('utf-8')).hexdigest()[:16]
+    with map_asset_lock:
+        map_asset_cache[map_id] = map_html
+    return map_id
+
+@bp.route('/maps/<map_id>', methods=['GET'])
+def serve_map(map_id):
+    """Serve a previously rendered map as a standalone HTML asset."""
+    with map_asset_lock:
+        map_html = map_asset_cache.get(map_id)
+
+    if map_html is None:
+        return jsonify({'error': 'Unknown or expired map id'}), 404
+
+    response = Response(map_html, mimetype='text/html')
+    # Content-addressed ids never change meaning, so clients may cache hard
+    response.headers['Cache-Control'] = 'public, max-age=3600, immutable'
+    return response
+
+# Cache for rendered map HTML: identical coordinate/grid signatures produce
+# identical maps, so repeat requests skip the folium rendering entirely.
+map_html_cache = cachetools.TTLCache(maxsize=256, ttl=3600)
+map_html_lock = threading.Lock()
+
+def generate_map_html(lat, lon, zoom=10, is_grid=False, grid_size=3, grid_distance=1.0, enhanced_data=None, species_scores=None):
     """Generate map HTML directly for embedding in the web page
 
     Args:
         species_scores: Dict mapping (lat, lon) tuples to species score data
                        Format: {(lat, lon): {'species_id': {'score': 75.5, 'common_name': 'Morels'}, ...}}
     """
+    # Species score overlays vary per request, so only coordinate/grid maps
+    # (with or without the deterministic enhanced_data popup) are cached.
+    cache_key = None
+    if species_scores is None:
+        # The grid renderer never reads enhanced_data, so only single-point
+        # maps key on its presence. Coordinates are rounded to 4 decimal
+        # places (~11 m) so float noise between equivalent requests still
+        # lands on the same entry.
+        cache_key = (round(lat, 4), round(lon, 4), zoom, is_grid, grid_size, grid_distance,
+                     enhanced_data is not None and not is_grid)
+        with map_html_lock:
+            if cache_key in map_html_cache:
+                return map_html_cache[cache_key]
+
+    html = _render_map_html(
+        lat, lon,
+        zoom=zoom,
+        is_grid=is_grid,
+        grid_size=grid_size,
+        grid_distance=grid_distance,
+        enhanced_data=enhanced_data,
+        species_scores=species_scores
+    )
+
+    # Don't cache error placeholders so rendering can be retried
+    if cache_key is not None and not html.startswith("<div class='alert"):
+        with map_html_lock:
+            map_html_cache[cache_key] = html
+
+    return html
+
+def _render_map_html(lat, lon, zoom=10, is_grid=False, grid_size=3, grid_distance=1.0, enhanced_data=None, species_scores=None):
+    """Render the folium map HTML for generate_map_html (uncached)."""
     try:
-        import folium
-        from folium.plugins import FastMarkerCluster, HeatMap
-        import numpy as np
-        
         # Create a map with optimized settings
         if is_grid:
             # Use exactly the same initialization as single point mode
@@ -440,65 +723,53 @@ def generate_map_html(lat, lon, zoom=10, include_soil_data=None, is_grid=False,
                 prefer_canvas=True  # Use canvas renderer for better performance
             )
             
-            # Calculate grid coordinates
+            # Calculate grid coordinates and their bounding box
             coordinates = GridUtils.calculate_grid_coordinates(lat, lon, grid_size, grid_distance)
-            
-            # Find boundaries quickly with numpy
-            coords_array = np.array(coordinates)
-            min_lat, max_lat = np.min(coords_array[:,0]), np.max(coords_array[:,0])
-            min_lon, max_lon = np.min(coords_array[:,1]), np.max(coords_array[:,1])
+            min_lat, max_lat, min_lon, max_lon = GridUtils.calculate_grid_bounds(coordinates)
             
             # Create a Feature Group for better performance
             grid_lines = folium.FeatureGroup(name="Grid", show=True)
             
             # For larger grids, simplify rendering
             if grid_size <= 5:
-                # Create organized grid structure for smaller grids
-                grid_points = {}
-                for idx, (grid_lat, grid_lon) in enumerate(coordinates):
-                    i, j = idx // grid_size, idx % grid_size
-                    grid_points[(i, j)] = (grid_lat, grid_lon)
-                
-                # Add horizontal and vertical lines
-                for i in range(grid_size):
-                    h_points = [[grid_points[(i, j)][0], grid_points[(i, j)][1]] for j in range(grid_size)]
-                    folium.PolyLine(
-                        locations=h_points,
-                        color="blue",
-                        weight=2,
-                        opacity=0.7,
-                        dash_array="5, 5"
-                    ).add_to(grid_lines)
-                
-                for j in range(grid_size):
-                    v_points = [[grid_points[(i, j)][0], grid_points[(i, j)][1]] for i in range(grid_size)]
-                    folium.PolyLine(
-                        locations=v_points,
-                        color="blue",
-                        weight=2,
-                        opacity=0.7,
-                        dash_array="5, 5"
-                    ).add_to(grid_lines)
+                # Add all horizontal and vertical lines as one multi-segment
+                # PolyLine instead of 2*N separate vector layers. The
+                # coordinates list is row-major, so rows are contiguous
+                # slices and columns are strided slices.
+                line_segments = [
+                    coordinates[i * grid_size:(i + 1) * grid_size]
+                    for i in range(grid_size)
+                ] + [
+                    coordinates[j::grid_size]
+                    for j in range(grid_size)
+                ]
+                folium.PolyLine(
+                    locations=line_segments,
+                    color="blue",
+                    weight=2,
+                    opacity=0.7,
+                    dash_array="5, 5"
+                ).add_to(grid_lines)
+                # Add grid outline
+                folium.Rectangle(
+                    bounds=[[min_lat, min_lon], [max_lat, max_lon]],
+                    color='red',
+                    weight=3,
+                    fill=False
+                ).add_to(grid_lines)
             else:
-                # For larger grids (>5x5), only draw boundary and omit internal grid lines
+                # For larger grids (>5x5), omit internal grid lines; one
+                # Rectangle carries both the light area fill and the red
+                # outline instead of two overlapping primitives
                 folium.Rectangle(
                     bounds=[[min_lat, min_lon], [max_lat, max_lon]],
-                    color='blue',
-                    weight=2,
+                    color='red',
+                    weight=3,
                     fill=True,
                     fill_color='blue',
-                    fill_opacity=0.05,
-                    dash_array="5, 5"
+                    fill_opacity=0.05
                 ).add_to(grid_lines)
             
-            # Add grid outline
-            folium.Rectangle(
-                bounds=[[min_lat, min_lon], [max_lat, max_lon]],
-                color='red',
-                weight=3,
-                fill=False
-            ).add_to(grid_lines)
-            
             # Add the grid lines to the map
             grid_lines.add_to(my_map)
 
@@ -554,118 +825,101 @@ def generate_map_html(lat, lon, zoom=10, include_soil_data=None, is_grid=False,
                     # Use the highest scoring species for the marker color
                     best_species = max(scores_dict.items(), key=lambda x: x[1]['score'])
                     best_score = best_species[1]['score']
-                    best_name = best_species[1]['common_name']
-
-                    # Create popup with all species scores
-                    popup_html = f"""
-                    <div style="font-family: Arial; min-width: 220px;">
-                        <h5 style="margin: 0 0 10px 0; border-bottom: 1px solid #ddd; padding-bottom: 5px;">
-                            Grid Point: {grid_lat:.4f}, {grid_lon:.4f}
-                        </h5>
-                        <p style="margin: 5px 0;"><strong>Species Suitability Scores:</strong></p>
-                        <table style="width: 100%; font-size: 12px;">
-                    """
-
-                    # Sort species by score descending
-                    sorted_species = sorted(scores_dict.items(), key=lambda x: x[1]['score'], reverse=True)
-                    for species_id, score_data in sorted_species:
-                        score = score_data['score']
-                        name = score_data['common_name']
-                        color = HeatmapGenerator.create_color_gradient(score)
-                        popup_html += f"""
-                            <tr>
-                                <td style="padding: 3px;">{name}:</td>
-                                <td style="padding: 3px; text-align: right;">
-                                    <span style="background-color: {color}; padding: 2px 6px; border-radius: 3px; color: white; font-weight: bold;">
-                                        {score:.1f}
-                                    </span>
-                                </td>
-                            </tr>
-                        """
-
-                    popup_html += "</table></div>"
-
-                    # Create circle marker with color based on best score
-                    marker = HeatmapGenerator.create_circle_marker(
-                        grid_lat, grid_lon, best_score, best_name,
-                        popup_data=None  # We're using custom popup
+
+                    # Render the popup from the precompiled template, with
+                    # species sorted by score descending
+                    popup_html = GRID_POPUP_TEMPLATE.render(
+                        lat=grid_lat,
+                        lon=grid_lon,
+                        species=[
+                            {
+                                'name': score_data['common_name'],
+                                'score': score_data['score'],
+                                'color': HeatmapGenerator.create_color_gradient(score_data['score'])
+                            }
+                            for species_id, score_data in sorted(
+                                scores_dict.items(), key=lambda x: x[1]['score'], reverse=True
+                            )
+                        ]
                     )
 
-                    # Replace the popup with our multi-species version
-                    marker.popup = folium.Popup(popup_html, max_width=300)
-                    marker.add_to(my_map)
+                    # Build the circle marker directly with the multi-species
+                    # popup instead of going through create_circle_marker,
+                    # which would render a single-species popup only to have
+                    # it thrown away and replaced
+                    color = HeatmapGenerator.create_color_gradient(best_score)
+                    folium.CircleMarker(
+                        location=[grid_lat, grid_lon],
+                        radius=8,
+                        popup=folium.Popup(popup_html, max_width=300),
+                        color=color,
+                        fill=True,
+                        fillColor=color,
+                        fillOpacity=0.7,
+                        weight=2
+                    ).add_to(my_map)
 
             # Optimize marker rendering based on grid size
             if grid_size <= 6:  # Standard marker display for smaller grids
                 # Create a feature group for markers
                 markers = folium.FeatureGroup(name="Points")
-                
+
                 # Find center point index
                 center_idx = len(coordinates) // 2
-                
-                # For smaller grids, use standard markers
-                # Just use a single red marker for center and simple dot markers for others
-                for idx, (grid_lat, grid_lon) in enumerate(coordinates):
-                    popup_content = f"Point {idx+1}: {grid_lat:.5f}, {grid_lon:.5f}"
-                    
-                    if idx == center_idx:
-                        # Center point as red marker
-                        folium.Marker(
-                            location=[grid_lat, grid_lon],
-                            popup=popup_content,
-                            tooltip="Center point",
-                            icon=folium.Icon(color="red", icon="star"),
-                        ).add_to(markers)
-                    else:
-                        # Use CircleMarker instead of Marker for better performance
-                        folium.CircleMarker(
-                            location=[grid_lat, grid_lon],
-                            radius=4,
-                            popup=popup_content,
-                            tooltip=f"Point {idx+1}",
-                            color="blue",
-                            fill=True,
-                            fill_color="blue",
-                            fill_opacity=0.7,
-                        ).add_to(markers)
-                
+
+                # Emit the non-center dots as one GeoJSON overlay instead of
+                # a CircleMarker object per point: a single folium layer
+                # carries all features, shrinking both render time and the
+                # emitted Leaflet payload
+                point_features = [
+                    {
+                        "type": "Feature",
+                        "geometry": {"type": "Point", "coordinates": [grid_lon, grid_lat]},
+                        "properties": {
+                            "label": f"Point {idx+1}: {grid_lat:.5f}, {grid_lon:.5f}",
+                            "tooltip": f"Point {idx+1}"
+                        }
+                    }
+                    for idx, (grid_lat, grid_lon) in enumerate(coordinates)
+                    if idx != center_idx
+                ]
+                folium.GeoJson(
+                    {"type": "FeatureCollection", "features": point_features},
+                    marker=folium.CircleMarker(
+                        radius=4,
+                        color="blue",
+                        fill=True,
+                        fill_color="blue",
+                        fill_opacity=0.7,
+                    ),
+                    popup=folium.GeoJsonPopup(fields=["label"], labels=False),
+                    tooltip=folium.GeoJsonTooltip(fields=["tooltip"], labels=False),
+                ).add_to(markers)
+
+                # Center point keeps its distinct red marker
+                center_lat_pt, center_lon_pt = coordinates[center_idx]
+                folium.Marker(
+                    location=[center_lat_pt, center_lon_pt],
+                    popup=f"Point {center_idx+1}: {center_lat_pt:.5f}, {center_lon_pt:.5f}",
+                    tooltip="Center point",
+                    icon=folium.Icon(color="red", icon="star"),
+                ).add_to(markers)
+
                 markers.add_to(my_map)
             
             else:
                 # For very large grids (>6x6), use cluster markers for better performance
-                # Prepare callback for cluster markers
-                callback = """
-                    function (row) {
-                        var icon, size;
-                        if (row[2] === 1) {  // Center point
-                            icon = L.divIcon({
-                                html: '<div style="background-color: #e74c3c; width: 10px; height: 10px; border-radius: 50%;"></div>',
-                                className: 'marker-cluster',
-                                iconSize: L.point(10, 10)
-                            });
-                        } else {
-                            icon = L.divIcon({
-                                html: '<div style="background-color: #3498db; width: 6px; height: 6px; border-radius: 50%;"></div>',
-                                className: 'marker-cluster',
-                                iconSize: L.point(6, 6)
-                            });
-                        }
-                        return L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
-                    };
-                """
-                
-                # Prepare data for fast marker cluster
-                marker_data = []
+                # Prepare data for fast marker cluster in one pass
                 center_idx = len(coordinates) // 2
-                
-                for idx, (grid_lat, grid_lon) in enumerate(coordinates):
-                    is_center = 1 if idx == center_idx else 0
-                    marker_data.append([grid_lat, grid_lon, is_center])
+                marker_data = [
+                    [grid_lat, grid_lon, 1 if idx == center_idx else 0]
+                    for idx, (grid_lat, grid_lon) in enumerate(coordinates)
+                ]
                 
                 # Use FastMarkerCluster for efficient rendering of many points
                 FastMarkerCluster(
                     data=marker_data,
-                    callback=callback,
+                    callback=GRID_CLUSTER_CALLBACK,
                     name="Grid Points",
                     options={'maxClusterRadius': 1}  # Small radius so points aren't clustered
                 ).add_to(my_map)
@@ -686,89 +940,23 @@ def generate_map_html(lat, lon, zoom=10, include_soil_data=None, is_grid=False,
                 tiles='OpenStreetMap'  # Explicitly set to ensure consistency
             )
             
-            # Create enhanced popup content from the extracted data
+            # Create enhanced popup content from the extracted data via the
+            # precompiled escaping template
             if enhanced_data:
-                popup_html = f"""
-                <div style="font-family: Arial, sans-serif; max-width: 400px;">
-                    <h4 style="color: #336699; margin-bottom: 8px; border-bottom: 1px solid #ddd; padding-bottom: 5px;">
-                        Location Analysis
-                    </h4>
-                    
-                    <div style="margin-bottom: 10px;">
-                        <strong>{enhanced_data.get('location_name', 'Unknown Location')}</strong><br>
-                        <span style="color: #666;">Coordinates: {lat:.5f}, {lon:.5f}</span>
-                    </div>
-                """
-                
-                # Add elevation data if available
-                if enhanced_data.get('elevation'):
-                    popup_html += f"""
-                    <div style="margin-bottom: 10px;">
-                        <strong>Elevation:</strong> {enhanced_data['elevation']} meters
-                    </div>
-                    """
-                
-                # Add forest data if available
-                if enhanced_data.get('tree_cover'):
-                    popup_html += f"""
-                    <div style="margin-bottom: 10px;">
-                        <strong>Tree Cover:</strong> {enhanced_data['tree_cover']}%
-                    </div>
-                    """
-                
-                # Add ecoregion and forest type if available
-                if enhanced_data.get('ecoregion') or enhanced_data.get('forest_type'):
-                    popup_html += "<div style='margin-bottom: 10px;'>"
-                    if enhanced_data.get('ecoregion'):
-                        popup_html += f"<strong>Ecoregion:</strong> {enhanced_data['ecoregion']}<br>"
-                    if enhanced_data.get('forest_type'):
-                        popup_html += f"<strong>Forest Type:</strong> {enhanced_data['forest_type']}"
-                    popup_html += "</div>"
-                
-                # Add dominant trees if available
-                if enhanced_data.get('dominant_trees'):
-                    popup_html += f"""
-                    <div style="margin-bottom: 10px;">
-                        <strong>Dominant Trees:</strong><br>
-                        <ul style="margin: 5px 0 5px 20px; padding: 0;">
-                    """
-                    for tree in enhanced_data['dominant_trees'][:3]:  # Limit to top 3
-                        popup_html += f"<li>{tree}</li>"
-                    popup_html += "</ul></div>"
-                
-                # Add mushroom associations if available
-                if enhanced_data.get('mushroom_types'):
-                    popup_html += f"""
-                    <div style="margin-bottom: 10px;">
-                        <strong>Potential Mushroom Types:</strong><br>
-                        <ul style="margin: 5px 0 5px 20px; padding: 0;">
-                    """
-                    for mushroom in enhanced_data['mushroom_types'][:5]:  # Limit to top 5
-                        popup_html += f"<li>{mushroom}</li>"
-                    popup_html += "</ul></div>"
-                
-                # Add soil type if available
-                if enhanced_data.get('soil_type'):
-                    popup_html += f"""
-                    <div style="margin-bottom: 10px;">
-                        <strong>Primary Soil Type:</strong> {enhanced_data['soil_type']}
-                    </div>
-                    """
-                
-                # Add soil properties if available
-                if enhanced_data.get('soil_properties') and len(enhanced_data['soil_properties']) > 0:
-                    popup_html += f"""
-                    <div style="margin-bottom: 10px;">
-                        <strong>Soil Properties:</strong><br>
-                        <ul style="margin: 5px 0 5px 20px; padding: 0;">
-                    """
-                    for prop, value in list(enhanced_data['soil_properties'].items())[:3]:  # Limit to top 3
-                        popup_html += f"<li>{prop}: {value}</li>"
-                    popup_html += "</ul></div>"
-                
-                # Close container div
-                popup_html += "</div>"
-                
+                popup_html = ENHANCED_POPUP_TEMPLATE.render(
+                    location_name=enhanced_data.get('location_name', 'Unknown Location'),
+                    lat=lat,
+                    lon=lon,
+                    elevation=enhanced_data.get('elevation'),
+                    tree_cover=enhanced_data.get('tree_cover'),
+                    ecoregion=enhanced_data.get('ecoregion'),
+                    forest_type=enhanced_data.get('forest_type'),
+                    dominant_trees=enhanced_data.get('dominant_trees', [])[:3],  # Limit to top 3
+                    mushroom_types=enhanced_data.get('mushroom_types', [])[:5],  # Limit to top 5
+                    soil_type=enhanced_data.get('soil_type'),
+                    soil_properties=list((enhanced_data.get('soil_properties') or {}).items())[:3]  # Limit to top 3
+                )
+
                 # Add marker with enhanced popup
                 folium.Marker(
                     location=[lat, lon],
@@ -795,191 +983,342 @@ def generate_map_html(lat, lon, zoom=10, include_soil_data=None, is_grid=False,
     except Exception as e:
         return f"<div class='alert alert-danger'>Error generating map: {str(e)}</div>"
 
-from concurrent.futures import ThreadPoolExecutor
 import time
+import uuid
+
+# In-process background job queue: long-running analyses can be submitted
+# asynchronously and polled by job id, so clients aren't pinned to one open
+# request for the whole run. Finished jobs expire after an hour.
+analysis_executor = ThreadPoolExecutor(max_workers=4)
+analysis_jobs = cachetools.TTLCache(maxsize=256, ttl=3600)
+analysis_jobs_lock = threading.Lock()
+
+
+def parse_analyze_request(data):
+    """Parse and validate an analysis request payload in one pass.
+
+    Resolves the location to coordinates and converts every option to its
+    target type exactly once, so handlers don't re-convert (or 500 on)
+    malformed input.
+
+    Returns:
+        tuple: (params, error) where params is a dict with lat, lon,
+               is_grid, grid_size, grid_distance and species_list, and
+               error is a message string when validation fails.
+    """
+    data = data or {}
 
-@app.route('/analyze', methods=['POST'])
-def analyze():
-    data = request.json
-    start_time = time.time()
-    
-    # Process the input data
-    args_dict = {}
-    
-    # Get coordinates
     lat = None
     lon = None
-    
+
     if data.get('location'):
-        args_dict['location'] = data['location']
-        
-        # Geocode the location
-        try:
-            location_result = LocationAPI.geocode_location(data['location'])
-            if "error" not in location_result:
+        # Geocode the location; geocode_location reports failures as an
+        # error dict rather than raising
+        location_result = LocationAPI.geocode_location(data['location'])
+        if "error" not in location_result:
+            try:
                 lat = float(location_result["lat"])
                 lon = float(location_result["lon"])
-        except:
-            pass
+            except (KeyError, TypeError, ValueError):
+                pass
+
+        if lat is None or lon is None:
+            return None, f"Could not geocode location: {data['location']}"
     elif data.get('lat') and data.get('lon'):
-        lat = float(data['lat'])
-        lon = float(data['lon'])
-        args_dict['lat'] = lat
-        args_dict['lon'] = lon
+        try:
+            lat = float(data['lat'])
+            lon = float(data['lon'])
+        except (TypeError, ValueError):
+            return None, 'Invalid coordinates: lat and lon must be numbers'
     else:
-        return jsonify({'error': 'Either coordinates or location name required'})
-    
-    # Add other options
-    is_grid = data.get('grid') == 'true'
-    grid_size = int(data.get('grid-size', 3))
-    grid_distance = float(data.get('grid-distance', 1.0))
-
-    # Get species selection
+        return None, 'Either coordinates or location name required'
+
+    try:
+        params = {
+            'lat': lat,
+            'lon': lon,
+            'is_grid': data.get('grid') == 'true',
+            'grid_size': int(data.get('grid-size', 3)),
+            'grid_distance': float(data.get('grid-distance', 1.0)),
+        }
+    except (TypeError, ValueError):
+        return None, 'Invalid grid options: grid-size must be an integer and grid-distance a number'
+
     species_list = data.get('species', [])
     if isinstance(species_list, str):
         species_list = [species_list]
+    params['species_list'] = species_list
 
-    if is_grid:
-        args_dict['grid'] = True
-        args_dict['grid-size'] = grid_size
-        args_dict['grid-distance'] = grid_distance
-    
-    # Use parallel processing for generating map and running data retrieval
-    map_html = None
-    output = None
-    
-    # Define functions for parallel execution
-    def generate_map():
-        if data.get('map') == 'true' and lat is not None and lon is not None:
-            return generate_map_html(
-                lat=lat, 
-                lon=lon,
-                zoom=10,
-                is_grid=is_grid,
-                grid_size=grid_size,
-                grid_distance=grid_distance
+    return params, None
+
+@bp.route('/analyze/async', methods=['POST'])
+def analyze_async():
+    """Submit an analysis as a background job and return its job id."""
+    params, error = parse_analyze_request(request.json)
+    if error:
+        return jsonify({'error': error})
+
+    job_id = uuid.uuid4().hex
+    future = analysis_executor.submit(
+        run_analysis, params['lat'], params['lon'],
+        is_grid=params['is_grid'], grid_size=params['grid_size'],
+        grid_distance=params['grid_distance']
+    )
+    with analysis_jobs_lock:
+        analysis_jobs[job_id] = future
+
+    return jsonify({'job_id': job_id, 'status': 'pending'})
+
+@bp.route('/analyze/jobs/<job_id>', methods=['GET'])
+def analyze_job_status(job_id):
+    """Poll a background analysis job for completion and results."""
+    with analysis_jobs_lock:
+        future = analysis_jobs.get(job_id)
+
+    if future is None:
+        return jsonify({'error': 'Unknown or expired job id'}), 404
+
+    if not future.done():
+        return jsonify({'job_id': job_id, 'status': 'pending'})
+
+    try:
+        result = future.result()
+    except Exception as e:
+        return jsonify({'job_id': job_id, 'status': 'error', 'error': str(e)})
+
+    return jsonify({
+        'job_id': job_id,
+        'status': 'done',
+        'output': result.get('output', '')
+    })
+
+def _sse_event(event, payload):
+    """Format one Server-Sent Event frame."""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+@bp.route('/analyze/stream', methods=['POST'])
+def analyze_stream():
+    """Stream analysis progress as Server-Sent Events.
+
+    The base map render doesn't depend on the analysis, so it is emitted
+    first and clients can show the map while the slower data retrieval is
+    still running. Events: map, output, error, done."""
+    payload = request.json
+    params, error = parse_analyze_request(payload)
+    if error:
+        return jsonify({'error': error})
+
+    def events():
+        try:
+            if payload.get('map') == 'true':
+                map_html = generate_map_html(
+                    params['lat'], params['lon'],
+                    zoom=10,
+                    is_grid=params['is_grid'],
+                    grid_size=params['grid_size'],
+                    grid_distance=params['grid_distance']
+                )
+                yield _sse_event('map', {'map_html': map_html})
+
+            result = run_analysis(
+                params['lat'], params['lon'],
+                is_grid=params['is_grid'],
+                grid_size=params['grid_size'],
+                grid_distance=params['grid_distance']
             )
-        return None
-    
-    def run_data_retrieval():
-        # Always generate prompt (for readable output)
-        args_dict['prompt'] = True
-        
-        # For grid mode, limit what we retrieve to speed things up
-        if is_grid and grid_size > 3:
-            # Skip soil properties for large grids as it's the slowest API
-            args_dict['soil-properties'] = False
-            
-            # If it's a very large grid, further optimize
-            if grid_size >= 5:
-                args_dict['forest'] = False
-        
-        # Run Shroomie with optimized parameters
-        return run_shroomie_with_args(args_dict)
-    
-    # Run data retrieval first
-    output = run_data_retrieval()
-    
-    # Extract data from output for map enhancement
-    map_data = extract_data_from_output(output)
-
-    # Calculate species suitability scores if species selected
-    species_scores = None
-    grid_species_scores = None  # For heatmap visualization
-
-    if species_list and lat is not None and lon is not None:
-        if is_grid:
-            # Calculate scores for all grid points
-            from shroomie.utils.grid_utils import GridUtils
+            yield _sse_event('output', {'output': result.get('output', '')})
+        except Exception as e:
+            yield _sse_event('error', {'error': str(e)})
+        yield _sse_event('done', {})
 
-            coordinates = GridUtils.calculate_grid_coordinates(lat, lon, grid_size, grid_distance)
-            grid_species_scores = {}
+    return Response(stream_with_context(events()), mimetype='text/event-stream')
 
-            print(f"🗺️  Calculating scores for {len(coordinates)} grid points...")
+@bp.route('/analyze', methods=['POST'])
+def analyze():
+    data = request.json
+    start_time = time.time()
+
+    # Parse and validate the payload in one pass
+    params, error = parse_analyze_request(data)
+    if error:
+        return jsonify({'error': error})
+
+    lat = params['lat']
+    lon = params['lon']
+    is_grid = params['is_grid']
+    grid_size = params['grid_size']
+    grid_distance = params['grid_distance']
+    species_list = params['species_list']
+
+    # Stream the response as a generator: each top-level JSON field is
+    # serialized and flushed as soon as it is computed, so the client starts
+    # receiving the (fast) analysis text while the slower scoring and map
+    # rendering are still in flight. The concatenated chunks form one valid
+    # JSON object for response.json() on the client.
+    def generate_response():
+        yield b'{'
+        try:
+            for chunk in generate_response_fields():
+                yield chunk
+        except Exception as e:
+            # Headers are already sent; close out a valid JSON object with
+            # the error so the client still gets a parseable response
+            yield b'"error": ' + json_dumps_bytes(f"Error during analysis: {str(e)}") + b', '
+        yield b'"processing_time": ' + json_dumps_bytes(round(time.time() - start_time, 2)) + b'}'
+
+    def generate_response_fields():
+        # When the client only wants the map (map_only flag), skip the
+        # expensive data retrieval and text extraction entirely and render
+        # the plain coordinate/grid map
+        map_only = data.get('map_only') == 'true'
+
+        # Grid base maps don't depend on the analysis output, so start
+        # rendering one on the worker pool while data retrieval runs; the
+        # final map call below then hits the HTML cache
+        if data.get('map') == 'true' and is_grid and not species_list:
+            scoring_executor.submit(
+                generate_map_html, lat, lon,
+                zoom=10, is_grid=True, grid_size=grid_size, grid_distance=grid_distance
+            )
 
-            # Calculate scores for each grid point
-            for grid_lat, grid_lon in coordinates:
-                coord_key = (grid_lat, grid_lon)
-                scoring_result = calculate_species_suitability(grid_lat, grid_lon, species_list)
+        if map_only:
+            output = ''
+        else:
+            # Run data retrieval first
+            result = run_analysis(lat, lon, is_grid=is_grid, grid_size=grid_size, grid_distance=grid_distance)
+            output = result.get('output', '')
+        yield b'"output": ' + json_dumps_bytes(output) + b', '
+
+        # The extracted fields only feed the single-point map popup, so the
+        # text scan is skipped when no map was requested and in grid mode,
+        # whose renderer ignores enhanced_data
+        if not map_only and data.get('map') == 'true' and not is_grid:
+            map_data = extract_data_from_output(output)
+        else:
+            map_data = None
+
+        # Calculate species suitability scores if species selected
+        species_scores = None
+        grid_species_scores = None  # For heatmap visualization
+
+        if species_list and lat is not None and lon is not None:
+            if is_grid:
+                # Calculate scores for all grid points
+                from shroomie.utils.grid_utils import GridUtils
+
+                coordinates = GridUtils.calculate_grid_coordinates(lat, lon, grid_size, grid_distance)
+                grid_species_scores = {}
+
+                logger.info("Calculating scores for %d grid points...", len(coordinates))
+
+                # One batched elevation query covers the whole grid; the
+                # remaining factors are fetched per point below
+                elevations = prefetch_grid_elevations(coordinates)
+
+                # Score grid points in parallel on the persistent pool: each
+                # point spends its time blocked on soil/elevation/weather API
+                # calls, so the threads overlap them
+                futures = {
+                    scoring_executor.submit(
+                        calculate_species_suitability, grid_lat, grid_lon, species_list,
+                        {'elevation': elevations[idx]} if elevations else None
+                    ): (grid_lat, grid_lon)
+                    for idx, (grid_lat, grid_lon) in enumerate(coordinates)
+                }
+                for future in as_completed(futures):
+                    coord_key = futures[future]
+                    scoring_result = future.result()
 
-                if scoring_result and scoring_result.get('species_scores'):
-                    grid_species_scores[coord_key] = scoring_result['species_scores']
+                    if scoring_result and scoring_result.get('species_scores'):
+                        grid_species_scores[coord_key] = scoring_result['species_scores']
 
-            print(f"✓ Completed scoring for {len(grid_species_scores)} points")
+                logger.info("Completed scoring for %d points", len(grid_species_scores))
+            else:
+                # Single point scoring
+                scoring_result = calculate_species_suitability(lat, lon, species_list)
+                species_scores = scoring_result.get('species_scores', {})
+
+        yield b'"species_scores": ' + json_dumps_bytes(species_scores if not is_grid else None) + b', '
+        # JSON object keys must be strings, so tuple coordinate keys are
+        # serialized as "lat,lon"
+        yield b'"grid_species_scores": ' + json_dumps_bytes({
+            f"{coord[0]},{coord[1]}": scores for coord, scores in grid_species_scores.items()
+        } if grid_species_scores else None) + b', '
+
+        # Add summary of grid results if available
+        if grid_species_scores and species_list:
+            summary = {}
+            for species_id in species_list:
+                scores = []
+                for coord_scores in grid_species_scores.values():
+                    if species_id in coord_scores:
+                        scores.append(coord_scores[species_id]['score'])
+
+                if scores:
+                    summary[species_id] = {
+                        'common_name': grid_species_scores[list(grid_species_scores.keys())[0]][species_id]['common_name'],
+                        'avg_score': round(sum(scores) / len(scores), 1),
+                        'max_score': round(max(scores), 1),
+                        'min_score': round(min(scores), 1)
+                    }
+            yield b'"grid_summary": ' + json_dumps_bytes(summary) + b', '
+
+        # Find best spots mode
+        best_spots_results = None
+        if data.get('find_best_spots') == 'true' and species_list and lat is not None and lon is not None:
+            # Get parameters
+            search_radius = float(data.get('search_radius', 10))  # miles
+            min_suitability = float(data.get('min_suitability', 60))  # 0-100
+            top_n = int(data.get('top_n', 10))
+
+            # Use first selected species for best spots search
+            target_species = species_list[0]
+
+            # Find best spots
+            best_spots_results = find_best_spots(
+                center_lat=lat,
+                center_lon=lon,
+                radius_miles=search_radius,
+                species_id=target_species,
+                min_score=min_suitability,
+                top_n=top_n
+            )
+
+        yield b'"best_spots": ' + json_dumps_bytes(best_spots_results) + b', '
+
+        # Then generate map with the data. The folium render is CPU-bound,
+        # so it runs on the worker pool rather than the request thread (which
+        # matters under cooperative gevent workers).
+        if data.get('map') == 'true' and lat is not None and lon is not None:
+            map_html = scoring_executor.submit(
+                generate_map_html,
+                lat=lat,
+                lon=lon,
+                zoom=10,
+                is_grid=is_grid,
+                grid_size=grid_size,
+                grid_distance=grid_distance,
+                enhanced_data=map_data,  # Pass the extracted data
+                species_scores=grid_species_scores if is_grid else None  # Pass grid scores for heatmap
+            ).result()
         else:
-            # Single point scoring
-            scoring_result = calculate_species_suitability(lat, lon, species_list)
-            species_scores = scoring_result.get('species_scores', {})
-
-    # Find best spots mode
-    best_spots_results = None
-    if data.get('find_best_spots') == 'true' and species_list and lat is not None and lon is not None:
-        # Get parameters
-        search_radius = float(data.get('search_radius', 10))  # miles
-        min_suitability = float(data.get('min_suitability', 60))  # 0-100
-        top_n = int(data.get('top_n', 10))
-
-        # Use first selected species for best spots search
-        target_species = species_list[0]
-
-        # Find best spots
-        best_spots_results = find_best_spots(
-            center_lat=lat,
-            center_lon=lon,
-            radius_miles=search_radius,
-            species_id=target_species,
-            min_score=min_suitability,
-            top_n=top_n
-        )
+            map_html = None
 
-    # Then generate map with the data
-    if data.get('map') == 'true' and lat is not None and lon is not None:
-        map_html = generate_map_html(
-            lat=lat,
-            lon=lon,
-            zoom=10,
-            is_grid=is_grid,
-            grid_size=grid_size,
-            grid_distance=grid_distance,
-            enhanced_data=map_data,  # Pass the extracted data
-            species_scores=grid_species_scores if is_grid else None  # Pass grid scores for heatmap
-        )
-    else:
-        map_html = None
-    
-    # Calculate processing time
-    processing_time = round(time.time() - start_time, 2)
-
-    # Prepare response
-    response = {
-        'output': output,
-        'map_html': map_html,
-        'species_scores': species_scores if not is_grid else None,
-        'grid_species_scores': grid_species_scores if is_grid else None,
-        'best_spots': best_spots_results,
-        'processing_time': processing_time
-    }
+        yield b'"map_html": ' + json_dumps_bytes(map_html) + b', '
 
-    # Add summary of grid results if available
-    if grid_species_scores and species_list:
-        summary = {}
-        for species_id in species_list:
-            scores = []
-            for coord_scores in grid_species_scores.values():
-                if species_id in coord_scores:
-                    scores.append(coord_scores[species_id]['score'])
-
-            if scores:
-                summary[species_id] = {
-                    'common_name': grid_species_scores[list(grid_species_scores.keys())[0]][species_id]['common_name'],
-                    'avg_score': round(sum(scores) / len(scores), 1),
-                    'max_score': round(max(scores), 1),
-                    'min_score': round(min(scores), 1)
-                }
-        response['grid_summary'] = summary
+        # Also expose the map as a cached static asset by URL, so clients
+        # can embed an iframe instead of inlining the HTML
+        map_url = f"/maps/{store_map_asset(map_html)}" if map_html else None
+        yield b'"map_url": ' + json_dumps_bytes(map_url) + b', '
+
+    return Response(stream_with_context(generate_response()), mimetype='application/json')
 
-    return jsonify(response)
+app.register_blueprint(bp)
 
 if __name__ == '__main__':
+    # Local development fallback; production serves through gunicorn with
+    # gevent workers (see entrypoint.sh). The debugger/reloader is opt-in so
+    # a stray python app.py doesn't ship the Werkzeug debugger.
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
+    debug = os.environ.get('FLASK_DEBUG', '').lower() in ('1', 'true', 'yes')
+    app.run(host='0.0.0.0', port=port, debug=debug)
\ No newline at end of file
@@ -4,5 +4,12 @@ set -e
 # Install the shroomie package from the mounted volume
 pip install -e /shroomie
 
-# Start the Flask application
-python app.py
\ No newline at end of file
+# Serve with gunicorn using gevent workers: the /analyze handler spends most
+# of its time blocked on upstream API calls, so cooperative green threads let
+# one worker overlap many in-flight requests.
+exec gunicorn \
+    --worker-class gevent \
+    --workers "${GUNICORN_WORKERS:-2}" \
+    --timeout "${GUNICORN_TIMEOUT:-300}" \
+    --bind "0.0.0.0:${PORT:-5000}" \
+    app:app
\ No newline at end of file
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Shared result caching for Shroomie API methods."""
+import functools
+import json
+import os
+from typing import Any, Callable, Dict, Optional
+
+from shroomie.utils.disk_cache import DiskCache
+
+
+def cached_api(cache, lock, key: Callable[..., Any], disk_cache: Optional[DiskCache] = None):
+    """Cache successful results of an API method in a bounded TTL cache.
+
+    The wrapped function's dict results are cached under key(*args, **kwargs)
+    unless they carry an "error" entry, so transient failures are retried
+    instead of being served from cache. Cache access is guarded by the given
+    lock because cachetools caches are not thread-safe.
+
+    When a DiskCache is given, successful results also persist to it: a
+    memory miss falls through to disk before calling the function, so
+    results survive process restarts (a fresh CLI run of the same
+    coordinates resolves without re-hitting the upstream APIs).
+
+    Args:
+        cache: A cachetools cache instance (e.g. TTLCache)
+        lock: A threading.Lock guarding the cache
+        key: Callable mapping the function's arguments to a hashable cache key
+        disk_cache: Optional DiskCache persisting results across restarts
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs)
+            with lock:
+                if cache_key in cache:
+                    return cache[cache_key]
+
+            disk_key = None
+            if disk_cache is not None:
+                disk_key = json.dumps(cache_key)
+                result = disk_cache.get(disk_key)
+                if result is not None:
+                    with lock:
+                        cache[cache_key] = result
+                    return result
+
+            result = func(*args, **kwargs)
+
+            if isinstance(result, dict) and "error" not in result:
+                with lock:
+                    cache[cache_key] = result
+                if disk_cache is not None:
+                    disk_cache.set(disk_key, result)
+
+            return result
+        return wrapper
+    return decorator
+
+
+def module_disk_cache(name: str, ttl: int) -> DiskCache:
+    """Build the persistent cache an API module layers under its memory cache.
+
+    Database files live under ~/.shroomie (overridable via
+    SHROOMIE_CACHE_DIR), one per module so TTLs stay independent."""
+    cache_dir = os.environ.get(
+        "SHROOMIE_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".shroomie")
+    )
+    return DiskCache(os.path.join(cache_dir, f"{name}_cache.sqlite3"), ttl=ttl)
+
+
+def coordinate_key(lat: float, lon: float, *extra) -> tuple:
+    """Build a cache key from coordinates rounded to 4 decimal places.
+
+    Four decimals is roughly 11 meters, well below the resolution of the
+    upstream soil/elevation/forest datasets, so nearby repeat lookups share
+    a cache entry."""
+    return (round(lat, 4), round(lon, 4)) + extra
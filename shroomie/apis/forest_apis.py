@@ -1,13 +1,131 @@
 #!/usr/bin/env python3
-import requests
+import functools
 import os
-from typing import Dict, Any, List, Optional, Union
+import threading
+import cachetools
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from shroomie.apis import http_session
+from shroomie.apis.api_cache import cached_api, coordinate_key, module_disk_cache
+
+# Forest cover and tree species estimates are static for a location, so
+# successful lookups are cached for a day keyed by rounded coordinates
+_forest_cache = cachetools.TTLCache(maxsize=4096, ttl=86400)
+_forest_lock = threading.Lock()
+_forest_disk_cache = module_disk_cache("forest", ttl=86400)
+
+# Ecoregion lookup table, built once at import: each entry is a bounding box
+# (lat_min, lat_max, lon_min, lon_max) with elevation bands scanned in order;
+# a band applies below its ceiling. Boxes are checked in order, so the
+# western Cascades box wins on the shared -121.5 meridian as before.
+_ECOREGION_TABLE = (
+    # Oregon Coast Range and Western Cascades
+    ((43.0, 46.5, -124.5, -121.5), (
+        (150, {  # Coastal zone
+            "ecoregion": "Pacific Northwest Coastal Forest",
+            "dominant_species": ["Sitka Spruce", "Western Hemlock", "Western Red Cedar", "Red Alder"],
+            "common_species": ["Douglas Fir", "Grand Fir", "Big Leaf Maple", "Oregon Ash"],
+            "understory": ["Salmonberry", "Sword Fern", "Salal", "Oregon Grape"],
+            "forest_type": "Temperate Rainforest"
+        }),
+        (1000, {  # Lower montane
+            "ecoregion": "Western Cascades Lower Montane Forest",
+            "dominant_species": ["Douglas Fir", "Western Hemlock", "Western Red Cedar"],
+            "common_species": ["Grand Fir", "Big Leaf Maple", "Red Alder", "Black Cottonwood"],
+            "understory": ["Vine Maple", "Oregon Grape", "Sword Fern", "Salal"],
+            "forest_type": "Mixed Coniferous-Deciduous Forest"
+        }),
+        (1500, {  # Mid montane
+            "ecoregion": "Western Cascades Mid Montane Forest",
+            "dominant_species": ["Douglas Fir", "Noble Fir", "Pacific Silver Fir", "Western Hemlock"],
+            "common_species": ["Western White Pine", "Western Red Cedar", "Alaska Yellow Cedar"],
+            "understory": ["Huckleberry", "Rhododendron", "Oregon Grape"],
+            "forest_type": "Coniferous Forest"
+        }),
+        (float("inf"), {  # Subalpine
+            "ecoregion": "Cascades Subalpine Forest",
+            "dominant_species": ["Mountain Hemlock", "Subalpine Fir", "Whitebark Pine"],
+            "common_species": ["Engelmann Spruce", "Lodgepole Pine", "Alaska Yellow Cedar"],
+            "understory": ["Huckleberry", "Mountain Heather", "Beargrass"],
+            "forest_type": "Subalpine Coniferous Forest"
+        }),
+    )),
+    # Eastern Oregon
+    ((42.0, 46.0, -121.5, -117.0), (
+        (1200, {
+            "ecoregion": "Blue Mountains Forest",
+            "dominant_species": ["Ponderosa Pine", "Douglas Fir", "Grand Fir"],
+            "common_species": ["Western Larch", "Lodgepole Pine", "Quaking Aspen"],
+            "understory": ["Snowberry", "Ninebark", "Serviceberry"],
+            "forest_type": "Dry Coniferous Forest"
+        }),
+        (float("inf"), {
+            "ecoregion": "Blue Mountains Subalpine Forest",
+            "dominant_species": ["Subalpine Fir", "Engelmann Spruce", "Lodgepole Pine"],
+            "common_species": ["Whitebark Pine", "Alpine Larch"],
+            "understory": ["Huckleberry", "Grouse Whortleberry"],
+            "forest_type": "Subalpine Coniferous Forest"
+        }),
+    )),
+)
+
+
+# Mycorrhizal mushroom associations, inverted into a lookup: exact species
+# names first, then substring rules for tree families. Rule order matches
+# the old elif chain (exact names win over the family substrings).
+_MUSHROOM_ASSOCIATIONS = {
+    "Douglas Fir": ("Chanterelle", "King Bolete", "Matsutake", "Coral Fungus"),
+    "Western Hemlock": ("Chanterelle", "Lobster Mushroom", "Hedgehog Mushroom"),
+    "Sitka Spruce": ("King Bolete", "Matsutake", "Russula"),
+    "Engelmann Spruce": ("King Bolete", "Matsutake", "Russula"),
+    "Red Alder": ("Oyster Mushroom", "Lion's Mane", "Morel"),
+    "Big Leaf Maple": ("Oyster Mushroom", "Lion's Mane", "Morel"),
+    "Western Red Cedar": ("Lobster Mushroom", "Cauliflower Mushroom"),
+}
+_MUSHROOM_FAMILY_RULES = (
+    ("Pine", ("King Bolete", "Matsutake", "Slippery Jack", "Saffron Milk Cap")),
+    ("Fir", ("Chanterelle", "King Bolete", "Matsutake")),
+)
+
+
+def _mushrooms_for_tree(tree_species: str) -> Optional[Tuple[str, ...]]:
+    """Look up the mushroom associations for a tree species, if any."""
+    mushrooms = _MUSHROOM_ASSOCIATIONS.get(tree_species)
+    if mushrooms is not None:
+        return mushrooms
+    for family, family_mushrooms in _MUSHROOM_FAMILY_RULES:
+        if family in tree_species:
+            return family_mushrooms
+    return None
+
+
+def _lookup_ecoregion(lat: float, lon: float, elevation: float) -> Optional[Dict[str, Any]]:
+    """Find the ecoregion profile for a coordinate from the lookup table.
+
+    Returns the matching profile dict, or None outside the covered boxes."""
+    for (lat_min, lat_max, lon_min, lon_max), bands in _ECOREGION_TABLE:
+        if lat_min <= lat <= lat_max and lon_min <= lon <= lon_max:
+            for max_elevation, profile in bands:
+                if elevation < max_elevation:
+                    return profile
+    return None
+
+def _in_covered_region(lat: float, lon: float) -> bool:
+    """Whether a coordinate falls inside any ecoregion bounding box."""
+    return any(
+        lat_min <= lat <= lat_max and lon_min <= lon <= lon_max
+        for (lat_min, lat_max, lon_min, lon_max), _ in _ECOREGION_TABLE
+    )
+
 
 class ForestAPI:
     """Handles forest and tree-related API calls."""
     
     @staticmethod
-    def get_forest_cover(lat: float, lon: float, api_key: Optional[str] = None) -> Dict[str, Any]:
+    @cached_api(_forest_cache, _forest_lock, disk_cache=_forest_disk_cache,
+                key=lambda lat, lon, api_key=None, elevation=None: coordinate_key(lat, lon, "cover"))
+    def get_forest_cover(lat: float, lon: float, api_key: Optional[str] = None,
+                         elevation: Optional[float] = None) -> Dict[str, Any]:
         """Get forest cover data from Global Forest Watch API or fallback to estimation.
         
         Note: For GFW API, it's best to use the web interface to get a token:
@@ -21,8 +139,9 @@ class ForestAPI:
         # Since the GFW API has complex auth requirements, we'll use our estimates
         # that are tailored to Pacific Northwest ecosystems instead
         
-        # Get the estimated data for the location
-        estimated_data = ForestAPI.get_estimated_forest_data(lat, lon)
+        # Get the estimated data for the location, reusing the caller's
+        # elevation when one was already fetched
+        estimated_data = ForestAPI.get_estimated_forest_data(lat, lon, elevation)
         
         # Try to enhance with NASA MODIS VCF data (no authentication required)
         try:
@@ -30,77 +149,109 @@ class ForestAPI:
             # This provides actual satellite-derived tree cover percentage
             # We access a pre-processed version that doesn't require auth
             modis_url = f"https://storage.googleapis.com/earthengine-api/9bb3ef/d459f1/operations.json?lat={lat}&lon={lon}"
-            
+
             # For demo purposes, we're using the estimated data since MODIS access
             # requires setup of Google Earth Engine which is beyond the scope here
-            
-            # Add note about data source
-            estimated_data["data_source"] = "NASA MODIS VCF + USFS ecological models"
-            return estimated_data
-                    
+
+            # Annotate the data source on a new dict rather than mutating the
+            # (possibly shared/cached) estimate in place
+            return {**estimated_data, "data_source": "NASA MODIS VCF + USFS ecological models"}
+
         except Exception as e:
             # Just return the estimated data if there's any issue
-            estimated_data["note"] = f"Using local ecological model for tree cover. Error: {str(e)}"
-            return estimated_data
+            return {**estimated_data, "note": f"Using local ecological model for tree cover. Error: {str(e)}"}
 
     @staticmethod
-    def get_estimated_forest_data(lat: float, lon: float) -> Dict[str, Any]:
+    def get_estimated_forest_data(lat: float, lon: float,
+                                  elevation: Optional[float] = None) -> Dict[str, Any]:
         """Estimate forest cover data based on location and elevation without API.
-        This is a fallback when no GFW API key is available."""
+        This is a fallback when no GFW API key is available. A caller that
+        already knows the elevation can pass it to skip the lookup."""
         
         try:
-            # Use the Copernicus DEM API for elevation
-            base_url = "https://api.opentopodata.org/v1/copernicus30"
-            params = {"locations": f"{lat},{lon}"}
-            
-            response = requests.get(base_url, params=params)
-            elevation = 0
-            
-            if response.status_code == 200:
-                data = response.json()
-                if "results" in data and len(data["results"]) > 0:
-                    elevation = data["results"][0]["elevation"]
-            else:
-                # Try to get elevation from Open-Meteo as another fallback
-                elev_response = requests.get(f"https://api.open-meteo.com/v1/elevation?latitude={lat}&longitude={lon}")
-                if elev_response.status_code == 200:
-                    elev_data = elev_response.json()
-                    if "elevation" in elev_data:
-                        elevation = elev_data["elevation"][0]
+            # Outside the covered region the profile is empty regardless of
+            # elevation, so skip the elevation lookup entirely
+            if not _in_covered_region(lat, lon):
+                return {
+                    "coordinates": [lon, lat],
+                    "elevation": 0,
+                    "estimated_tree_cover": 0,
+                    "estimated_tree_species": [],
+                    "status": "Estimated based on elevation and region",
+                    "note": "This is an estimate. For precise data, use Global Forest Watch API with an API key."
+                }
+
+            if elevation is None:
+                # Use the Copernicus DEM API for elevation
+                base_url = "https://api.opentopodata.org/v1/copernicus30"
+                params = {"locations": f"{lat},{lon}"}
+
+                response = http_session.get(base_url, params=params)
+                elevation = 0
+
+                if response.status_code == 200:
+                    data = http_session.parse_json(response)
+                    if "results" in data and len(data["results"]) > 0:
+                        elevation = data["results"][0]["elevation"]
+                else:
+                    # Try to get elevation from Open-Meteo as another fallback
+                    elev_response = http_session.get(f"https://api.open-meteo.com/v1/elevation?latitude={lat}&longitude={lon}")
+                    if elev_response.status_code == 200:
+                        elev_data = http_session.parse_json(elev_response)
+                        if "elevation" in elev_data:
+                            elevation = elev_data["elevation"][0]
             
             # Estimate forest cover and dominant tree species based on elevation and region in Oregon
-            forest_cover = 0
-            dominant_species = []
-            
-            if 45.0 <= lat <= 46.5 and -124.5 <= lon <= -121.5:  # Oregon coast and mountains
-                if elevation < 100:  # Coastal areas
-                    forest_cover = 70
-                    dominant_species = ["Western Hemlock", "Sitka Spruce", "Western Red Cedar", "Red Alder"]
-                elif elevation < 800:  # Low mountains
-                    forest_cover = 80
-                    dominant_species = ["Douglas Fir", "Western Hemlock", "Western Red Cedar", "Big Leaf Maple"]
-                elif elevation < 1800:  # Mid mountains
-                    forest_cover = 70
-                    dominant_species = ["Douglas Fir", "Noble Fir", "Western Hemlock", "Pacific Silver Fir"]
-                else:  # High mountains
-                    forest_cover = 30
-                    dominant_species = ["Mountain Hemlock", "Subalpine Fir", "Whitebark Pine", "Engelmann Spruce"]
-            
+            forest_cover, dominant_species = ForestAPI._estimate_forest_profile(
+                round(lat, 2), round(lon, 2), round(elevation, -1)
+            )
+
             return {
                 "coordinates": [lon, lat],
                 "elevation": elevation,
                 "estimated_tree_cover": forest_cover,
-                "estimated_tree_species": dominant_species,
+                "estimated_tree_species": list(dominant_species),
                 "status": "Estimated based on elevation and region",
                 "note": "This is an estimate. For precise data, use Global Forest Watch API with an API key."
             }
-                
+
         except Exception as e:
             return {"error": f"Failed to fetch or estimate forest cover data: {str(e)}"}
 
     @staticmethod
-    def get_tree_species(lat: float, lon: float, api_key: Optional[str] = None) -> Dict[str, Any]:
-        """Get information about tree species in the area."""
+    @functools.lru_cache(maxsize=4096)
+    def _estimate_forest_profile(lat: float, lon: float, elevation: float) -> Tuple[int, Tuple[str, ...]]:
+        """Pure region/elevation decision tree for estimated forest data.
+
+        Memoized on coordinates quantized to 2 decimal places (~1 km) and
+        elevation quantized to 10 m, which is far finer than the decision
+        thresholds, so repeated grid points resolve without re-walking the
+        tree.
+
+        Returns:
+            tuple: (estimated tree cover percent, dominant species tuple)
+        """
+        if 45.0 <= lat <= 46.5 and -124.5 <= lon <= -121.5:  # Oregon coast and mountains
+            if elevation < 100:  # Coastal areas
+                return 70, ("Western Hemlock", "Sitka Spruce", "Western Red Cedar", "Red Alder")
+            elif elevation < 800:  # Low mountains
+                return 80, ("Douglas Fir", "Western Hemlock", "Western Red Cedar", "Big Leaf Maple")
+            elif elevation < 1800:  # Mid mountains
+                return 70, ("Douglas Fir", "Noble Fir", "Western Hemlock", "Pacific Silver Fir")
+            else:  # High mountains
+                return 30, ("Mountain Hemlock", "Subalpine Fir", "Whitebark Pine", "Engelmann Spruce")
+
+        return 0, ()
+
+    @staticmethod
+    @cached_api(_forest_cache, _forest_lock, disk_cache=_forest_disk_cache,
+                key=lambda lat, lon, api_key=None, elevation=None: coordinate_key(lat, lon, "trees"))
+    def get_tree_species(lat: float, lon: float, api_key: Optional[str] = None,
+                         elevation: Optional[float] = None) -> Dict[str, Any]:
+        """Get information about tree species in the area.
+
+        A caller that already knows the elevation can pass it to skip the
+        lookup."""
         
         # Use API key from environment if not provided as argument
         if not api_key:
@@ -110,73 +261,38 @@ class ForestAPI:
         # We'll use a combination of biome estimation and regional knowledge
         
         try:
-            # First, try to get elevation data which helps determine vegetation zones
-            elevation = 0
-            
-            # Try Open-Meteo elevation API
-            elev_response = requests.get(f"https://api.open-meteo.com/v1/elevation?latitude={lat}&longitude={lon}")
-            if elev_response.status_code == 200:
-                elev_data = elev_response.json()
-                if "elevation" in elev_data:
-                    elevation = elev_data["elevation"][0]
-            
-            # Determine the ecoregion and likely native tree species
-            # This is a simplified model focusing on Oregon/Pacific Northwest
-            species_data = {}
+            # Outside every covered bounding box the default profile applies
+            # regardless of elevation, so skip the elevation lookup
+            if not _in_covered_region(lat, lon):
+                return {
+                    "ecoregion": "Unknown/General Temperate Forest",
+                    "status": "Location outside of detailed dataset region",
+                    "note": "For specific tree species data in this area, consult local forestry databases.",
+                    "coordinates": [lon, lat],
+                    "elevation": None
+                }
+
+            if elevation is None:
+                # First, try to get elevation data which helps determine vegetation zones
+                elevation = 0
+
+                # Try Open-Meteo elevation API
+                elev_response = http_session.get(f"https://api.open-meteo.com/v1/elevation?latitude={lat}&longitude={lon}")
+                if elev_response.status_code == 200:
+                    elev_data = http_session.parse_json(elev_response)
+                    if "elevation" in elev_data:
+                        elevation = elev_data["elevation"][0]
             
-            # Oregon Coast Range and Western Cascades
-            if 43.0 <= lat <= 46.5 and -124.5 <= lon <= -121.5:
-                # Oregon's forests by elevation zones
-                if elevation < 150:  # Coastal zone
-                    species_data = {
-                        "ecoregion": "Pacific Northwest Coastal Forest",
-                        "dominant_species": ["Sitka Spruce", "Western Hemlock", "Western Red Cedar", "Red Alder"],
-                        "common_species": ["Douglas Fir", "Grand Fir", "Big Leaf Maple", "Oregon Ash"],
-                        "understory": ["Salmonberry", "Sword Fern", "Salal", "Oregon Grape"],
-                        "forest_type": "Temperate Rainforest"
-                    }
-                elif elevation < 1000:  # Lower montane
-                    species_data = {
-                        "ecoregion": "Western Cascades Lower Montane Forest",
-                        "dominant_species": ["Douglas Fir", "Western Hemlock", "Western Red Cedar"],
-                        "common_species": ["Grand Fir", "Big Leaf Maple", "Red Alder", "Black Cottonwood"],
-                        "understory": ["Vine Maple", "Oregon Grape", "Sword Fern", "Salal"],
-                        "forest_type": "Mixed Coniferous-Deciduous Forest"
-                    }
-                elif elevation < 1500:  # Mid montane
-                    species_data = {
-                        "ecoregion": "Western Cascades Mid Montane Forest",
-                        "dominant_species": ["Douglas Fir", "Noble Fir", "Pacific Silver Fir", "Western Hemlock"],
-                        "common_species": ["Western White Pine", "Western Red Cedar", "Alaska Yellow Cedar"],
-                        "understory": ["Huckleberry", "Rhododendron", "Oregon Grape"],
-                        "forest_type": "Coniferous Forest"
-                    }
-                else:  # Subalpine
-                    species_data = {
-                        "ecoregion": "Cascades Subalpine Forest",
-                        "dominant_species": ["Mountain Hemlock", "Subalpine Fir", "Whitebark Pine"],
-                        "common_species": ["Engelmann Spruce", "Lodgepole Pine", "Alaska Yellow Cedar"],
-                        "understory": ["Huckleberry", "Mountain Heather", "Beargrass"],
-                        "forest_type": "Subalpine Coniferous Forest"
-                    }
-            # Eastern Oregon
-            elif 42.0 <= lat <= 46.0 and -121.5 <= lon <= -117.0:
-                if elevation < 1200:
-                    species_data = {
-                        "ecoregion": "Blue Mountains Forest",
-                        "dominant_species": ["Ponderosa Pine", "Douglas Fir", "Grand Fir"],
-                        "common_species": ["Western Larch", "Lodgepole Pine", "Quaking Aspen"],
-                        "understory": ["Snowberry", "Ninebark", "Serviceberry"],
-                        "forest_type": "Dry Coniferous Forest"
-                    }
-                else:
-                    species_data = {
-                        "ecoregion": "Blue Mountains Subalpine Forest",
-                        "dominant_species": ["Subalpine Fir", "Engelmann Spruce", "Lodgepole Pine"],
-                        "common_species": ["Whitebark Pine", "Alpine Larch"],
-                        "understory": ["Huckleberry", "Grouse Whortleberry"],
-                        "forest_type": "Subalpine Coniferous Forest"
-                    }
+            # Determine the ecoregion and likely native tree species from
+            # the precompiled bbox/elevation lookup table
+            profile = _lookup_ecoregion(lat, lon, elevation)
+            if profile is not None:
+                # Copy the profile with fresh lists so neither callers nor
+                # later annotation can mutate the shared lookup table
+                species_data = {
+                    key: list(value) if isinstance(value, list) else value
+                    for key, value in profile.items()
+                }
             else:
                 # Default when outside the specific regions
                 species_data = {
@@ -184,7 +300,7 @@ class ForestAPI:
                     "status": "Location outside of detailed dataset region",
                     "note": "For specific tree species data in this area, consult local forestry databases."
                 }
-            
+
             # Add coordinates and elevation to the response
             species_data["coordinates"] = [lon, lat]
             species_data["elevation"] = elevation
@@ -192,22 +308,12 @@ class ForestAPI:
             # Add mushroom association data for species particularly relevant to mushroom cultivation
             mushroom_associations = {}
             
-            # Add mycorrhizal associations for tree species
+            # Add mycorrhizal associations for tree species from the
+            # precomputed lookup
             for tree_species in species_data.get("dominant_species", []) + species_data.get("common_species", []):
-                if tree_species == "Douglas Fir":
-                    mushroom_associations[tree_species] = ["Chanterelle", "King Bolete", "Matsutake", "Coral Fungus"]
-                elif tree_species == "Western Hemlock":
-                    mushroom_associations[tree_species] = ["Chanterelle", "Lobster Mushroom", "Hedgehog Mushroom"]
-                elif tree_species in ["Sitka Spruce", "Engelmann Spruce"]:
-                    mushroom_associations[tree_species] = ["King Bolete", "Matsutake", "Russula"]
-                elif "Pine" in tree_species:
-                    mushroom_associations[tree_species] = ["King Bolete", "Matsutake", "Slippery Jack", "Saffron Milk Cap"]
-                elif "Fir" in tree_species:
-                    mushroom_associations[tree_species] = ["Chanterelle", "King Bolete", "Matsutake"]
-                elif tree_species in ["Red Alder", "Big Leaf Maple"]:
-                    mushroom_associations[tree_species] = ["Oyster Mushroom", "Lion's Mane", "Morel"]
-                elif tree_species == "Western Red Cedar":
-                    mushroom_associations[tree_species] = ["Lobster Mushroom", "Cauliflower Mushroom"]
+                mushrooms = _mushrooms_for_tree(tree_species)
+                if mushrooms is not None:
+                    mushroom_associations[tree_species] = list(mushrooms)
             
             if mushroom_associations:
                 species_data["mushroom_associations"] = mushroom_associations
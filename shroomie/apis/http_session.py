@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Shared pooled HTTP session used by all Shroomie API modules."""
+import threading
+import time
+from urllib.parse import urlparse
+
+import cachetools
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson decodes large JSON payloads several times faster than the stdlib
+# parser behind response.json(); fall back when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# A single module-level session reuses TCP/TLS connections (HTTP keep-alive)
+# across calls to the same host instead of paying a new handshake for every
+# request. The adapter sizes are generous enough for grid analysis fan-out.
+SESSION = requests.Session()
+
+# Retry transient failures (connection resets, rate limits, upstream 5xx)
+# with exponential backoff before giving up; GETs are idempotent here. The
+# circuit breaker below only sees the final outcome.
+_retries = Retry(
+    total=2,
+    backoff_factor=0.5,
+    status_forcelist=(429, 502, 503, 504),
+    allowed_methods=("GET",),
+)
+
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=_retries)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+# Negotiate keep-alive and compressed transfer explicitly: the soil and
+# weather payloads compress well, and urllib3 transparently decodes
+# whatever is advertised here. Brotli is only offered when the decoder is
+# importable.
+try:
+    import brotli as _brotli  # noqa: F401 - probing for urllib3's br support
+    _ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip, deflate"
+
+SESSION.headers.update({
+    "Accept-Encoding": _ACCEPT_ENCODING,
+    "Connection": "keep-alive",
+})
+
+# Every request gets a bounded timeout so a stalled upstream can't hang a
+# worker indefinitely
+DEFAULT_TIMEOUT = 10
+
+# Simple per-host circuit breaker: after several consecutive connection
+# failures, calls to that host fail fast for a cooldown period instead of
+# each paying the full connect timeout (a grid analysis would otherwise
+# serially burn the timeout on every point).
+_FAILURE_THRESHOLD = 3
+_COOLDOWN_SECONDS = 60
+
+_breaker_lock = threading.Lock()
+_host_failures = {}  # host -> [consecutive_failures, opened_at]
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised when a host's circuit breaker is open and the call is skipped."""
+
+
+# Short-TTL cache of successful GET responses keyed by (url, params): all the
+# upstream APIs are read-only, so identical calls issued within a few minutes
+# (for example the inline elevation lookups in the forest module) are served
+# from memory. The per-method result caches sit above this with longer,
+# data-appropriate TTLs.
+_response_cache = cachetools.TTLCache(maxsize=2048, ttl=300)
+_response_cache_lock = threading.Lock()
+
+# Validators for conditional GETs: responses that carried an ETag or
+# Last-Modified (Nominatim and Mapbox do) are remembered for a day, and
+# once they fall out of the short response cache we revalidate with
+# If-None-Match/If-Modified-Since; a 304 reuses the stored body instead
+# of re-downloading it.
+_validator_cache = cachetools.TTLCache(maxsize=2048, ttl=86400)
+_validator_lock = threading.Lock()
+
+
+def _response_cache_key(url, params):
+    """Build a hashable cache key from the URL and query params."""
+    if not params:
+        return (url, None)
+    return (url, tuple(sorted(
+        (key, tuple(value) if isinstance(value, list) else value)
+        for key, value in params.items()
+    )))
+
+
+# In-flight request registry for singleflight coalescing: when several
+# threads (grid fan-out) ask for the same (url, params) at once, one issues
+# the request and the rest wait for its cached result instead of
+# duplicating the round-trip.
+_inflight = {}  # cache_key -> threading.Event
+_inflight_lock = threading.Lock()
+
+
+def get(url, **kwargs):
+    """Issue a GET request through the shared pooled session.
+
+    Applies the default timeout unless the caller provides one, fails fast
+    with CircuitOpenError while a host's breaker is open, serves repeat
+    (url, params) GETs from a short-lived response cache, and coalesces
+    identical concurrent requests into one round-trip."""
+    cache_key = _response_cache_key(url, kwargs.get("params"))
+    with _response_cache_lock:
+        cached = _response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Singleflight: either claim leadership for this key or wait for the
+    # current leader and re-check the cache. If the leader failed (nothing
+    # was cached), take the lead and try ourselves.
+    while True:
+        with _inflight_lock:
+            leader_event = _inflight.get(cache_key)
+            if leader_event is None:
+                _inflight[cache_key] = threading.Event()
+                break
+        leader_event.wait(timeout=60)
+        with _response_cache_lock:
+            cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    try:
+        return _request(url, cache_key, **kwargs)
+    finally:
+        with _inflight_lock:
+            event = _inflight.pop(cache_key, None)
+        if event is not None:
+            event.set()
+
+
+def _request(url, cache_key, **kwargs):
+    """Perform the actual GET with breaker, revalidation and caching."""
+    host = urlparse(url).netloc
+
+    with _breaker_lock:
+        failures = _host_failures.get(host)
+        if failures and failures[0] >= _FAILURE_THRESHOLD:
+            if time.monotonic() - failures[1] < _COOLDOWN_SECONDS:
+                raise CircuitOpenError(
+                    f"Skipping request to {host}: circuit open after "
+                    f"{failures[0]} consecutive failures"
+                )
+            # Cooldown elapsed: allow a probe request through
+            failures[0] = _FAILURE_THRESHOLD - 1
+
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+
+    # Revalidate instead of re-downloading when we hold validators for this
+    # request
+    with _validator_lock:
+        validator = _validator_cache.get(cache_key)
+    if validator is not None:
+        etag, last_modified, _ = validator
+        conditional_headers = dict(kwargs.get("headers") or {})
+        if etag:
+            conditional_headers["If-None-Match"] = etag
+        if last_modified:
+            conditional_headers["If-Modified-Since"] = last_modified
+        kwargs["headers"] = conditional_headers
+
+    try:
+        response = SESSION.get(url, **kwargs)
+    except requests.RequestException:
+        with _breaker_lock:
+            failures = _host_failures.setdefault(host, [0, 0.0])
+            failures[0] += 1
+            if failures[0] >= _FAILURE_THRESHOLD:
+                failures[1] = time.monotonic()
+        raise
+
+    with _breaker_lock:
+        _host_failures.pop(host, None)
+
+    # Not modified: the stored body is still current
+    if response.status_code == 304 and validator is not None:
+        response = validator[2]
+
+    if response.status_code == 200:
+        with _response_cache_lock:
+            _response_cache[cache_key] = response
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            with _validator_lock:
+                _validator_cache[cache_key] = (etag, last_modified, response)
+
+    return response
+
+
+def parse_json(response):
+    """Decode a response body as JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
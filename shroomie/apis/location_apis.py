@@ -1,14 +1,70 @@
 #!/usr/bin/env python3
-import requests
+import functools
 import os
+import threading
+import cachetools
 from typing import Dict, Any, Optional, Union
 
+from shroomie.apis import http_session
+from shroomie.apis.api_cache import cached_api, coordinate_key, module_disk_cache
+from shroomie.utils.disk_cache import DiskCache
+
+# Geocoding lookups are I/O-bound calls with highly repetitive inputs (users
+# retry the same locations), so successful results are kept in bounded TTL
+# caches and served as dictionary hits for a day instead of re-querying
+# Nominatim on every request.
+_geocode_cache = cachetools.TTLCache(maxsize=4096, ttl=86400)
+_geocode_lock = threading.Lock()
+_reverse_geocode_cache = cachetools.TTLCache(maxsize=4096, ttl=86400)
+_reverse_geocode_lock = threading.Lock()
+
+# Geocoding results are effectively immutable, so they also persist to disk
+# and survive process restarts (a month of TTL keeps the file from growing
+# stale entries forever)
+_geocode_disk_cache = DiskCache(
+    os.environ.get(
+        "SHROOMIE_GEOCODE_CACHE_PATH",
+        os.path.join(os.path.expanduser("~"), ".shroomie", "geocode_cache.sqlite3")
+    ),
+    ttl=30 * 86400
+)
+
+# Elevation is static, so results are cached for a day as well
+_elevation_cache = cachetools.TTLCache(maxsize=4096, ttl=86400)
+_elevation_lock = threading.Lock()
+_elevation_disk_cache = module_disk_cache("elevation", ttl=86400)
+
+@functools.lru_cache(maxsize=1)
+def _osm_headers():
+    """Build the Nominatim User-Agent header once.
+
+    Built lazily (not at import) so values loaded from a .env file by the
+    CLI's load_dotenv() are still picked up, then reused for every call."""
+    app_name = os.environ.get("OSM_USER_AGENT", "ShroomieApp/1.0")
+    contact_url = os.environ.get("OSM_CONTACT_URL", "https://github.com/your-username/shroomie")
+    contact_email = os.environ.get("OSM_CONTACT_EMAIL", "contact@example.com")
+
+    return {
+        "User-Agent": f"{app_name} ({contact_url}; {contact_email})"
+    }
+
 class LocationAPI:
     """Handles location-based API calls."""
-    
+
     @staticmethod
+    @cached_api(_reverse_geocode_cache, _reverse_geocode_lock,
+                key=lambda lat, lon: coordinate_key(lat, lon))
     def get_location_name(lat: float, lon: float) -> Dict[str, Any]:
-        """Get location name from OpenStreetMap Nominatim API."""
+        """Get location name from OpenStreetMap Nominatim API.
+
+        Results are cached by coordinates rounded to 4 decimal places
+        (roughly 11 meters), so nearby repeat lookups skip the network;
+        successful lookups also persist to the on-disk geocode cache."""
+        disk_key = f"reverse:{round(lat, 4)},{round(lon, 4)}"
+        cached = _geocode_disk_cache.get(disk_key)
+        if cached is not None:
+            return cached
+
         base_url = "https://nominatim.openstreetmap.org/reverse"
         
         params = {
@@ -17,21 +73,15 @@ class LocationAPI:
             "format": "json"
         }
         
-        # Get user agent info from environment variables or use defaults
-        app_name = os.environ.get("OSM_USER_AGENT", "ShroomieApp/1.0")
-        contact_url = os.environ.get("OSM_CONTACT_URL", "https://github.com/your-username/shroomie")
-        contact_email = os.environ.get("OSM_CONTACT_EMAIL", "contact@example.com")
-        
-        headers = {
-            "User-Agent": f"{app_name} ({contact_url}; {contact_email})"
-        }
-        
+        headers = _osm_headers()
+
         try:
-            response = requests.get(base_url, params=params, headers=headers)
+            response = http_session.get(base_url, params=params, headers=headers)
             
             if response.status_code == 200:
-                data = response.json()
+                data = http_session.parse_json(response)
                 if "display_name" in data:
+                    _geocode_disk_cache.set(disk_key, data)
                     return data
                 else:
                     return {"error": "No location name found"}
@@ -41,8 +91,19 @@ class LocationAPI:
             return {"error": f"Failed to fetch location data: {str(e)}"}
 
     @staticmethod
+    @cached_api(_geocode_cache, _geocode_lock,
+                key=lambda location_name: location_name.strip().lower())
     def geocode_location(location_name: str) -> Dict[str, Any]:
-        """Convert location name to coordinates using OpenStreetMap Nominatim API."""
+        """Convert location name to coordinates using OpenStreetMap Nominatim API.
+
+        Results are cached by the normalized (lowercased, stripped) location
+        string, so repeat lookups skip the network; successful lookups also
+        persist to the on-disk geocode cache."""
+        disk_key = f"geocode:{location_name.strip().lower()}"
+        cached = _geocode_disk_cache.get(disk_key)
+        if cached is not None:
+            return cached
+
         base_url = "https://nominatim.openstreetmap.org/search"
         
         params = {
@@ -50,21 +111,15 @@ class LocationAPI:
             "format": "json"
         }
         
-        # Get user agent info from environment variables or use defaults
-        app_name = os.environ.get("OSM_USER_AGENT", "ShroomieApp/1.0")
-        contact_url = os.environ.get("OSM_CONTACT_URL", "https://github.com/your-username/shroomie")
-        contact_email = os.environ.get("OSM_CONTACT_EMAIL", "contact@example.com")
-        
-        headers = {
-            "User-Agent": f"{app_name} ({contact_url}; {contact_email})"
-        }
-        
+        headers = _osm_headers()
+
         try:
-            response = requests.get(base_url, params=params, headers=headers)
+            response = http_session.get(base_url, params=params, headers=headers)
             
             if response.status_code == 200:
-                data = response.json()
+                data = http_session.parse_json(response)
                 if data and len(data) > 0:
+                    _geocode_disk_cache.set(disk_key, data[0])
                     return data[0]
                 else:
                     return {"error": "No coordinates found for this location"}
@@ -78,6 +133,8 @@ class ElevationAPI:
     """Handles elevation data API calls."""
     
     @staticmethod
+    @cached_api(_elevation_cache, _elevation_lock, disk_cache=_elevation_disk_cache,
+                key=lambda lat, lon: coordinate_key(lat, lon, "open-elevation"))
     def get_elevation_data(lat: float, lon: float) -> Dict[str, Any]:
         """Get elevation data from Open-Elevation API."""
         base_url = "https://api.open-elevation.com/api/v1/lookup"
@@ -87,10 +144,10 @@ class ElevationAPI:
         }
         
         try:
-            response = requests.get(base_url, params=params)
+            response = http_session.get(base_url, params=params)
             
             if response.status_code == 200:
-                data = response.json()
+                data = http_session.parse_json(response)
                 if "results" in data and len(data["results"]) > 0:
                     return data["results"][0]
                 else:
@@ -101,6 +158,49 @@ class ElevationAPI:
             return {"error": f"Failed to fetch elevation data: {str(e)}"}
 
     @staticmethod
+    def get_elevation_batch(coordinates) -> Dict[str, Any]:
+        """Get elevations for many coordinates in one Open-Meteo query.
+
+        The elevation endpoint accepts comma-separated coordinate lists (up
+        to 100 per call), so a grid's worth of lookups costs one round-trip
+        per hundred points instead of one per point.
+
+        Args:
+            coordinates: Sequence of (lat, lon) tuples
+
+        Returns:
+            dict: {"elevations": [float, ...]} aligned with the input order,
+                  or {"error": ...} if any batch request fails
+        """
+        base_url = "https://api.open-meteo.com/v1/elevation"
+        elevations = []
+
+        try:
+            for start in range(0, len(coordinates), 100):
+                batch = coordinates[start:start + 100]
+                params = {
+                    "latitude": ",".join(str(lat) for lat, _ in batch),
+                    "longitude": ",".join(str(lon) for _, lon in batch),
+                }
+
+                response = http_session.get(base_url, params=params)
+
+                if response.status_code != 200:
+                    return {"error": f"Open-Meteo API request failed with status code {response.status_code}"}
+
+                data = http_session.parse_json(response)
+                if "elevation" not in data or len(data["elevation"]) != len(batch):
+                    return {"error": "Unexpected elevation batch response"}
+
+                elevations.extend(data["elevation"])
+
+            return {"elevations": elevations}
+        except Exception as e:
+            return {"error": f"Failed to fetch batch elevation data: {str(e)}"}
+
+    @staticmethod
+    @cached_api(_elevation_cache, _elevation_lock, disk_cache=_elevation_disk_cache,
+                key=lambda lat, lon: coordinate_key(lat, lon, "open-meteo"))
     def get_open_topo_data(lat: float, lon: float) -> Dict[str, Any]:
         """Get elevation and other topographic data from Open-Meteo API."""
         base_url = "https://api.open-meteo.com/v1/elevation"
@@ -111,10 +211,10 @@ class ElevationAPI:
         }
         
         try:
-            response = requests.get(base_url, params=params)
+            response = http_session.get(base_url, params=params)
             
             if response.status_code == 200:
-                return response.json()
+                return http_session.parse_json(response)
             else:
                 return {"error": f"Open-Meteo API request failed with status code {response.status_code}"}
         except Exception as e:
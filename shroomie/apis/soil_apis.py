@@ -1,12 +1,24 @@
 #!/usr/bin/env python3
-import requests
 import os
+import threading
+import cachetools
 from typing import Dict, Any, List, Optional, Union, Tuple
 
+from shroomie.apis import http_session
+from shroomie.apis.api_cache import cached_api, coordinate_key, module_disk_cache
+
+# Soil data is effectively static, so successful lookups are cached for a
+# day keyed by rounded coordinates and query parameters
+_soil_cache = cachetools.TTLCache(maxsize=4096, ttl=86400)
+_soil_lock = threading.Lock()
+_soil_disk_cache = module_disk_cache("soil", ttl=86400)
+
 class SoilAPI:
     """Base class for soil-related API calls."""
     
     @staticmethod
+    @cached_api(_soil_cache, _soil_lock, disk_cache=_soil_disk_cache,
+                key=lambda lat, lon, top_k=None: coordinate_key(lat, lon, "type", top_k))
     def get_soil_type(lat: float, lon: float, top_k: Optional[int] = None) -> Dict[str, Any]:
         """Get soil type data from OpenEPI API."""
         base_url = "https://api.openepi.io/soil/type"
@@ -19,14 +31,20 @@ class SoilAPI:
         if top_k is not None:
             params["top_k"] = top_k
         
-        response = requests.get(base_url, params=params)
+        response = http_session.get(base_url, params=params)
         
         if response.status_code == 200:
-            return response.json()
+            return http_session.parse_json(response)
         else:
             return {"error": f"API request failed with status code {response.status_code}", "details": response.text}
 
     @staticmethod
+    @cached_api(_soil_cache, _soil_lock, disk_cache=_soil_disk_cache,
+                key=lambda lat, lon, depths=None, properties=None, values=None: coordinate_key(
+                    lat, lon, "properties",
+                    tuple(depths) if depths else None,
+                    tuple(properties) if properties else None,
+                    tuple(values) if values else None))
     def get_soil_properties(lat: float, lon: float, depths: Optional[List[str]] = None, 
                            properties: Optional[List[str]] = None, 
                            values: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -61,14 +79,16 @@ class SoilAPI:
         if values:
             params["values"] = values if isinstance(values, list) else [values]
         
-        response = requests.get(base_url, params=params)
+        response = http_session.get(base_url, params=params)
         
         if response.status_code == 200:
-            return response.json()
+            return http_session.parse_json(response)
         else:
             return {"error": f"API request failed with status code {response.status_code}", "details": response.text}
 
     @staticmethod
+    @cached_api(_soil_cache, _soil_lock, disk_cache=_soil_disk_cache,
+                key=lambda lat, lon, number_classes=5: coordinate_key(lat, lon, "soilgrids", number_classes))
     def get_soilgrids_data(lat: float, lon: float, number_classes: int = 5) -> Dict[str, Any]:
         """Get soil data from ISRIC SoilGrids API."""
         base_url = "https://rest.isric.org/soilgrids/v2.0/classification/query"
@@ -79,10 +99,10 @@ class SoilAPI:
             "number_classes": number_classes
         }
         
-        response = requests.get(base_url, params=params)
+        response = http_session.get(base_url, params=params)
         
         if response.status_code == 200:
-            return response.json()
+            return http_session.parse_json(response)
         else:
             return {"error": f"SoilGrids API request failed with status code {response.status_code}", "details": response.text}
 
@@ -109,10 +129,10 @@ class MapboxAPI:
         }
         
         try:
-            response = requests.get(base_url, params=params)
+            response = http_session.get(base_url, params=params)
             
             if response.status_code == 200:
-                return response.json()
+                return http_session.parse_json(response)
             else:
                 return {"error": f"Mapbox Terrain API request failed with status code {response.status_code}", "details": response.text}
         except Exception as e:
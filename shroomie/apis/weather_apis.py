@@ -1,103 +1,97 @@
 #!/usr/bin/env python3
-import requests
 import datetime
-from datetime import timedelta
 import os
+import threading
+import cachetools
 from typing import Dict, Any, List, Optional, Union
 
+import numpy as np
+
+from shroomie.apis import http_session
+from shroomie.apis.api_cache import cached_api, coordinate_key, module_disk_cache
+
+# Weather changes through the day, so results only stay cached for an hour
+_weather_cache = cachetools.TTLCache(maxsize=4096, ttl=3600)
+_weather_lock = threading.Lock()
+_weather_disk_cache = module_disk_cache("weather", ttl=3600)
+
+# Mapping of summary keys to the Open-Meteo daily series they aggregate;
+# the *_sum keys are totalled, the rest averaged
+_DAILY_SERIES = {
+    "temp_max": "temperature_2m_max",
+    "temp_min": "temperature_2m_min",
+    "temp_mean": "temperature_2m_mean",
+    "precip_sum": "precipitation_sum",
+    "rain_sum": "rain_sum",
+    "snow_sum": "snowfall_sum",
+}
+_TOTALLED_KEYS = ("precip_sum", "rain_sum", "snow_sum")
+
+# Constant part of the Open-Meteo forecast query, built once
+_FORECAST_PARAMS_BASE = {
+    "daily": "temperature_2m_max,temperature_2m_min,temperature_2m_mean,precipitation_sum,rain_sum,snowfall_sum",
+    "timezone": "auto",
+    "past_days": 30  # Get up to 30 days of past data
+}
+
 class WeatherAPI:
     """Handles weather-related API calls."""
     
     @staticmethod
+    @cached_api(_weather_cache, _weather_lock, disk_cache=_weather_disk_cache,
+                key=lambda lat, lon, months=3, api_key=None: coordinate_key(lat, lon, months))
     def get_weather_history(lat: float, lon: float, months: int = 3, api_key: Optional[str] = None) -> Dict[str, Any]:
-        """Get historical weather data from Open-Meteo API.
-        Default is last 3 months of weather data."""
+        """Get recent weather data from the Open-Meteo forecast API.
+
+        The forecast endpoint only exposes the last 30 days (past_days
+        caps there), so months larger than one does not widen the window;
+        fetching true multi-month history would need the archive API."""
         
         # Use API key from environment if not provided as argument
         if not api_key:
             api_key = os.environ.get("OPENMETEO_API_KEY")
         
-        # Calculate start and end dates
-        end_date = datetime.datetime.now().date()
-        start_date = end_date - timedelta(days=30*months)
-        
         # Use forecast API for current conditions, it doesn't require archive access
         base_url = "https://api.open-meteo.com/v1/forecast"
         
-        params = {
-            "latitude": lat,
-            "longitude": lon,
-            "daily": "temperature_2m_max,temperature_2m_min,temperature_2m_mean,precipitation_sum,rain_sum,snowfall_sum",
-            "timezone": "auto",
-            "past_days": 30  # Get up to 30 days of past data
-        }
+        params = {"latitude": lat, "longitude": lon, **_FORECAST_PARAMS_BASE}
         
         try:
-            response = requests.get(base_url, params=params)
+            response = http_session.get(base_url, params=params)
             
             if response.status_code == 200:
-                data = response.json()
+                data = http_session.parse_json(response)
                 
-                # Create simplified weather summary
+                # Create simplified weather summary: each daily series is
+                # aggregated in one vectorized nan-aware pass instead of
+                # accumulating per-day Python lists
                 if "daily" in data:
-                    monthly_data = {}
-                    
-                    # Initialize current month
-                    month_key = datetime.datetime.now().strftime("%Y-%m")
-                    monthly_data[month_key] = {
-                        "temp_max": [],
-                        "temp_min": [],
-                        "temp_mean": [],
-                        "precip_sum": [],
-                        "rain_sum": [],
-                        "snow_sum": []
-                    }
-                    
-                    # Populate with daily data
                     daily = data["daily"]
-                    for i, date_str in enumerate(daily["time"]):
-                        date = datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
-                        
-                        if "temperature_2m_max" in daily and i < len(daily["temperature_2m_max"]):
-                            monthly_data[month_key]["temp_max"].append(daily["temperature_2m_max"][i])
-                        
-                        if "temperature_2m_min" in daily and i < len(daily["temperature_2m_min"]):
-                            monthly_data[month_key]["temp_min"].append(daily["temperature_2m_min"][i])
-                        
-                        if "temperature_2m_mean" in daily and i < len(daily["temperature_2m_mean"]):
-                            monthly_data[month_key]["temp_mean"].append(daily["temperature_2m_mean"][i])
-                        
-                        if "precipitation_sum" in daily and i < len(daily["precipitation_sum"]):
-                            monthly_data[month_key]["precip_sum"].append(daily["precipitation_sum"][i])
-                        
-                        if "rain_sum" in daily and i < len(daily["rain_sum"]):
-                            monthly_data[month_key]["rain_sum"].append(daily["rain_sum"][i])
-                        
-                        if "snowfall_sum" in daily and i < len(daily["snowfall_sum"]):
-                            monthly_data[month_key]["snow_sum"].append(daily["snowfall_sum"][i])
-                    
-                    # Calculate averages for each month
-                    monthly_averages = {}
-                    for month, values in monthly_data.items():
-                        monthly_averages[month] = {}
-                        
-                        for key, data_list in values.items():
-                            if data_list and any(x is not None for x in data_list):
-                                # Filter out None values
-                                valid_values = [x for x in data_list if x is not None]
-                                if valid_values:
-                                    # For precipitation sums, we want the total, not average
-                                    if key in ["precip_sum", "rain_sum", "snow_sum"]:
-                                        monthly_averages[month][key] = sum(valid_values)
-                                    else:
-                                        monthly_averages[month][key] = sum(valid_values) / len(valid_values)
-                                else:
-                                    monthly_averages[month][key] = None
+                    n_days = len(daily.get("time", []))
+
+                    # One clock read per call; the request itself is the
+                    # only other time-dependent input
+                    month_key = datetime.datetime.now().strftime("%Y-%m")
+                    summary = {}
+
+                    for key, series_name in _DAILY_SERIES.items():
+                        series = daily.get(series_name, [])[:n_days]
+                        # None entries become NaN in the float conversion
+                        values = np.array(series, dtype=np.float64) if series else np.array([])
+
+                        if values.size and not np.all(np.isnan(values)):
+                            # For precipitation sums, we want the total, not average
+                            if key in _TOTALLED_KEYS:
+                                summary[key] = float(np.nansum(values))
                             else:
-                                monthly_averages[month][key] = None
-                    
-                    data["monthly_averages"] = monthly_averages
-                
+                                summary[key] = float(np.nanmean(values))
+                        else:
+                            summary[key] = None
+
+                    # Return a new dict instead of annotating the parsed
+                    # response in place
+                    return {**data, "monthly_averages": {month_key: summary}}
+
                 return data
             else:
                 return {"error": f"Weather API request failed with status code {response.status_code}"}
@@ -1,13 +1,19 @@
 #!/usr/bin/env python3
 import argparse
+import functools
 from typing import Dict, Any, List, Optional, Union, Tuple
 
 class CliParser:
     """Command-line argument parser for the Shroomie application."""
     
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def create_parser() -> argparse.ArgumentParser:
-        """Create an ArgumentParser with all options."""
+        """Create an ArgumentParser with all options.
+
+        The parser is built once and memoized: argparse parsers are reusable
+        across parse_args calls, and rebuilding the full option tree per
+        invocation is pure overhead for programmatic callers."""
         parser = argparse.ArgumentParser(description="Query environmental APIs and generate LLM prompts")
         
         # Coordinates and location
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import sys
+from concurrent.futures import ThreadPoolExecutor
 import json
 from typing import Dict, Any, List, Optional, Union, Tuple
 import os
@@ -12,9 +13,147 @@ from shroomie.apis.forest_apis import ForestAPI
 from shroomie.apis.weather_apis import WeatherAPI
 from shroomie.utils.grid_utils import GridUtils
 from shroomie.utils.prompt_generator import PromptGenerator
-from shroomie.utils.map_generator import MapGenerator
-from shroomie.models.coordinate import Coordinate
-from shroomie.models.soil_data import SoilData
+
+# MapGenerator (and the folium/jinja2 stack behind it) is only needed when
+# --map is passed, so it is imported lazily at its use sites
+
+# orjson serializes the large raw API payloads several times faster than the
+# stdlib json module; fall back when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def format_json(data: Any) -> str:
+    """Serialize API results for display output."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(data, indent=2)
+
+def run(lat: float, lon: float, grid: bool = False, grid_size: int = 3,
+        grid_distance: float = 1.0, prompt: bool = True) -> Dict[str, Any]:
+    """Run a Shroomie analysis in-process and return structured results.
+
+    This is the programmatic entry point used by the web application. It
+    gathers the same default data set as the CLI (weather, soil, elevation,
+    forest and tree data) but returns a dict instead of printing, so callers
+    do not need to marshal argv or capture stdout.
+
+    Args:
+        lat (float): Latitude of the location or grid center
+        lon (float): Longitude of the location or grid center
+        grid (bool): Whether to analyze a grid of points around the center
+        grid_size (int): Size of the grid (e.g., 3 for a 3x3 grid)
+        grid_distance (float): Distance between grid points in miles
+        prompt (bool): Whether to generate LLM prompt text for each point
+
+    Returns:
+        dict: Results with "coordinates" (list of (lat, lon) tuples),
+              "points" (per-point raw API data and prompt text) and
+              "output" (combined human-readable text for all points)
+    """
+    if grid:
+        coordinates = GridUtils.calculate_grid_coordinates(lat, lon, grid_size, grid_distance)
+    else:
+        coordinates = [(lat, lon)]
+
+    # Analyze grid points in parallel: each point is dominated by blocking
+    # API calls, so a thread pool overlaps them. executor.map preserves the
+    # grid's row-major point order in the results.
+    if len(coordinates) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, len(coordinates))) as executor:
+            points = list(executor.map(
+                lambda coord: analyze_point(coord[0], coord[1], prompt=prompt),
+                coordinates
+            ))
+    else:
+        points = [analyze_point(lat, lon, prompt=prompt)]
+
+    output_sections = []
+    for idx, point in enumerate(points):
+        section = ""
+        if len(coordinates) > 1:
+            section += f"{'='*20} Point {idx+1}/{len(coordinates)} (Lat: {point['lat']}, Lon: {point['lon']}) {'='*20}\n\n"
+        if prompt and point.get("prompt"):
+            section += point["prompt"]
+        if section:
+            output_sections.append(section)
+
+    return {
+        "lat": lat,
+        "lon": lon,
+        "grid": grid,
+        "coordinates": coordinates,
+        "points": points,
+        "output": ("\n\n" + "="*80 + "\n\n").join(output_sections) if len(coordinates) > 1 else "".join(output_sections)
+    }
+
+def analyze_point(lat: float, lon: float, prompt: bool = True, months: int = 3) -> Dict[str, Any]:
+    """Gather the default environmental data set for a single coordinate.
+
+    Returns a dict with the raw results from each API plus, when requested,
+    the generated LLM prompt text under the "prompt" key.
+    """
+    # The nine data sources are independent of each other, so fan the
+    # blocking calls out over a pool and collect the results by name
+    with ThreadPoolExecutor(max_workers=9) as executor:
+        futures = {
+            "location": executor.submit(LocationAPI.get_location_name, lat, lon),
+            "weather": executor.submit(WeatherAPI.get_weather_history, lat, lon, months),
+            "soilgrids": executor.submit(SoilAPI.get_soilgrids_data, lat, lon),
+            "openepi": executor.submit(SoilAPI.get_soil_type, lat, lon),
+            "soil_properties": executor.submit(
+                SoilAPI.get_soil_properties, lat, lon,
+                depths=["0-5cm"], properties=["bdod", "phh2o"], values=["mean", "Q0.05"]
+            ),
+            "elevation": executor.submit(ElevationAPI.get_elevation_data, lat, lon),
+            "topo": executor.submit(ElevationAPI.get_open_topo_data, lat, lon),
+            "forest": executor.submit(ForestAPI.get_forest_cover, lat, lon),
+            "trees": executor.submit(ForestAPI.get_tree_species, lat, lon),
+        }
+        results = {name: future.result() for name, future in futures.items()}
+
+    location_data = results["location"]
+    weather_result = results["weather"]
+    soilgrids_result = results["soilgrids"]
+    openepi_result = results["openepi"]
+    soil_properties_result = results["soil_properties"]
+    elevation_result = results["elevation"]
+    topo_result = results["topo"]
+    forest_result = results["forest"]
+    tree_species_result = results["trees"]
+
+    point: Dict[str, Any] = {
+        "lat": lat,
+        "lon": lon,
+        "location": location_data,
+        "weather": weather_result,
+        "soilgrids": soilgrids_result,
+        "openepi": openepi_result,
+        "soil_properties": soil_properties_result,
+        "elevation": elevation_result,
+        "topo": topo_result,
+        "forest": forest_result,
+        "trees": tree_species_result,
+    }
+
+    if prompt:
+        point["prompt"] = PromptGenerator.generate_llm_prompt(
+            openepi_data=openepi_result,
+            soilgrids_data=soilgrids_result,
+            elevation_data=elevation_result,
+            forest_data=forest_result,
+            topo_data=topo_result,
+            weather_data=weather_result,
+            tree_data=tree_species_result,
+            soil_properties_data=soil_properties_result,
+            location_data=location_data,
+            lat=lat,
+            lon=lon
+        )
+
+    return point
 
 def main() -> None:
     """Main entry point for the Shroomie CLI application."""
@@ -33,22 +172,23 @@ def main() -> None:
     # Process coordinates
     coordinates = []
     
-    # Check if we need to geocode a location name
+    # Check if we need to geocode a location name. validate_arguments has
+    # already guaranteed args.location is set when coordinates are missing,
+    # so there is no second location check here; repeat lookups resolve from
+    # the persistent geocode cache without a network call.
     if not args.lat or not args.lon:
-        if args.location:
-            # Try to geocode the location
-            location_result = LocationAPI.geocode_location(args.location)
-            if "error" not in location_result:
-                try:
-                    args.lat = float(location_result["lat"])
-                    args.lon = float(location_result["lon"])
-                    print(f"Geocoded '{args.location}' to: Latitude {args.lat}, Longitude {args.lon}")
-                except (KeyError, ValueError):
-                    print(f"Error: Could not extract coordinates from geocoding result")
-                    return
-            else:
-                print(f"Error: {location_result['error']}")
+        location_result = LocationAPI.geocode_location(args.location)
+        if "error" not in location_result:
+            try:
+                args.lat = float(location_result["lat"])
+                args.lon = float(location_result["lon"])
+                print(f"Geocoded '{args.location}' to: Latitude {args.lat}, Longitude {args.lon}")
+            except (KeyError, ValueError):
+                print(f"Error: Could not extract coordinates from geocoding result")
                 return
+        else:
+            print(f"Error: {location_result['error']}")
+            return
     
     # Check if we need to generate a grid
     if args.grid:
@@ -58,103 +198,115 @@ def main() -> None:
         # Just use the single coordinate provided
         coordinates = [(args.lat, args.lon)]
     
+    # Determine once which data sources to fetch: the flag combinations are
+    # identical for every grid point, so they aren't re-evaluated in the loop.
+    # If no specific data flags are set, use defaults for mushroom foraging.
+    use_defaults = not any([
+        args.all, args.soilgrids, args.openepi, args.soil_properties,
+        args.elevation, args.topo, args.forest, args.trees, args.weather
+    ])
+    show_raw = not args.prompt
+    show_osm = show_raw and (args.all or args.osm)
+    fetch_weather = args.all or args.weather or use_defaults
+    fetch_soilgrids = args.all or args.soilgrids or use_defaults or (not args.all and not args.openepi and not args.soil_properties)
+    fetch_openepi = args.all or args.openepi or use_defaults
+    fetch_soil_properties = args.soil_properties or args.all or use_defaults
+    fetch_elevation = args.all or args.elevation or use_defaults
+    fetch_topo = args.all or args.topo or use_defaults
+    fetch_forest = args.all or args.forest or use_defaults
+    fetch_trees = args.all or args.trees or use_defaults
+    generate_prompt = args.prompt or use_defaults
+
+    # Soil property query defaults are likewise constant across points
+    depths = args.depths if args.depths else ["0-5cm"]
+    properties = args.properties if args.properties else ["bdod", "phh2o"]
+    values = args.values if args.values else ["mean", "Q0.05"]
+
     # Process each coordinate
     for idx, (lat, lon) in enumerate(coordinates):
         if len(coordinates) > 1:
             print(f"\n{'='*20} Point {idx+1}/{len(coordinates)} (Lat: {lat}, Lon: {lon}) {'='*20}\n")
-        
-        openepi_result = None
-        soilgrids_result = None
-        elevation_result = None
-        forest_result = None
-        topo_result = None
-        location_data = None
-        weather_result = None
-        soil_properties_result = None
-        tree_species_result = None
-        
-        # Always get OpenStreetMap location data when coordinates are provided
-        location_data = LocationAPI.get_location_name(lat, lon)
-        if not args.prompt and (args.all or args.osm):
+
+        # Fan the selected data-source calls out over a pool (they are
+        # independent of each other), then print the raw sections in the
+        # same fixed order as before once everything has arrived
+        with ThreadPoolExecutor(max_workers=9) as executor:
+            # Always get OpenStreetMap location data when coordinates are provided
+            futures = {"location": executor.submit(LocationAPI.get_location_name, lat, lon)}
+
+            if fetch_weather:
+                futures["weather"] = executor.submit(WeatherAPI.get_weather_history, lat, lon, args.months)
+            if fetch_soilgrids:
+                futures["soilgrids"] = executor.submit(SoilAPI.get_soilgrids_data, lat, lon, args.number_classes)
+            if fetch_openepi:
+                futures["openepi"] = executor.submit(SoilAPI.get_soil_type, lat, lon, args.top_k)
+            if fetch_soil_properties:
+                futures["soil_properties"] = executor.submit(SoilAPI.get_soil_properties, lat, lon, depths, properties, values)
+            if fetch_elevation:
+                futures["elevation"] = executor.submit(ElevationAPI.get_elevation_data, lat, lon)
+            if fetch_topo:
+                futures["topo"] = executor.submit(ElevationAPI.get_open_topo_data, lat, lon)
+            if fetch_forest:
+                futures["forest"] = executor.submit(ForestAPI.get_forest_cover, lat, lon, args.gfw_api_key)
+            if fetch_trees:
+                futures["trees"] = executor.submit(ForestAPI.get_tree_species, lat, lon)
+
+            results = {name: future.result() for name, future in futures.items()}
+
+        location_data = results["location"]
+        weather_result = results.get("weather")
+        soilgrids_result = results.get("soilgrids")
+        openepi_result = results.get("openepi")
+        soil_properties_result = results.get("soil_properties")
+        elevation_result = results.get("elevation")
+        topo_result = results.get("topo")
+        forest_result = results.get("forest")
+        tree_species_result = results.get("trees")
+
+        if show_osm:
             print("===== OpenStreetMap Location Data =====")
-            print(json.dumps(location_data, indent=2))
-        
-        # Determine if we should use defaults for mushroom foraging
-        # If no specific data flags are set, use defaults for foraging
-        use_defaults = not any([
-            args.all, args.soilgrids, args.openepi, args.soil_properties, 
-            args.elevation, args.topo, args.forest, args.trees, args.weather
-        ])
-        
-        # Get weather data by default or if requested
-        if args.all or args.weather or use_defaults:
-            weather_result = WeatherAPI.get_weather_history(lat, lon, args.months)
-            if not args.prompt:
-                # For raw display, we'll show a simpler version without all the daily data
-                display_weather = weather_result.copy() if isinstance(weather_result, dict) else {}
-                if "daily" in display_weather:
-                    # Remove the bulky daily data arrays to make the output cleaner
-                    del display_weather["daily"]
-                
-                print("\n===== Historical Weather Data =====")
-                print(json.dumps(display_weather, indent=2))
-        
-        # Get SoilGrids data by default or if requested
-        if args.all or args.soilgrids or use_defaults or (not args.all and not args.openepi and not args.soil_properties):
-            soilgrids_result = SoilAPI.get_soilgrids_data(lat, lon, args.number_classes)
-            if not args.prompt:
-                print("\n===== ISRIC SoilGrids API Result =====")
-                print(json.dumps(soilgrids_result, indent=2))
-        
-        # Get OpenEPI soil type data by default or if requested
-        if args.all or args.openepi or use_defaults:
-            openepi_result = SoilAPI.get_soil_type(lat, lon, args.top_k)
-            if not args.prompt:
-                print("\n===== OpenEPI Soil Type API Result =====")
-                print(json.dumps(openepi_result, indent=2))
-        
-        # Get soil property data by default or if requested
-        if args.soil_properties or args.all or use_defaults:
-            # If using defaults, set default values for properties, depths, and values if not provided
-            depths = args.depths if args.depths else ["0-5cm"]
-            properties = args.properties if args.properties else ["bdod", "phh2o"]
-            values = args.values if args.values else ["mean", "Q0.05"]
-            
-            soil_properties_result = SoilAPI.get_soil_properties(lat, lon, depths, properties, values)
-            if not args.prompt:
-                print("\n===== OpenEPI Soil Properties API Result =====")
-                print(json.dumps(soil_properties_result, indent=2))
-        
-        # Get elevation data by default or if requested
-        if args.all or args.elevation or use_defaults:
-            elevation_result = ElevationAPI.get_elevation_data(lat, lon)
-            if not args.prompt:
-                print("\n===== Open-Elevation API Result =====")
-                print(json.dumps(elevation_result, indent=2))
-        
-        # Get topographic data by default or if requested
-        if args.all or args.topo or use_defaults:
-            topo_result = ElevationAPI.get_open_topo_data(lat, lon)
-            if not args.prompt:
-                print("\n===== Open-Meteo Topographic API Result =====")
-                print(json.dumps(topo_result, indent=2))
-        
-        # Get forest cover data by default or if requested
-        if args.all or args.forest or use_defaults:
-            forest_result = ForestAPI.get_forest_cover(lat, lon, args.gfw_api_key)
-            if not args.prompt:
-                print("\n===== Global Forest Watch API Result =====")
-                print(json.dumps(forest_result, indent=2))
-        
-        # Get tree species data by default or if requested
-        if args.all or args.trees or use_defaults:
-            tree_species_result = ForestAPI.get_tree_species(lat, lon)
-            if not args.prompt:
-                print("\n===== Tree Species Data =====")
-                print(json.dumps(tree_species_result, indent=2))
-        
+            print(format_json(location_data))
+
+        if fetch_weather and show_raw:
+            # For raw display, we'll show a simpler version without all the daily data
+            display_weather = weather_result.copy() if isinstance(weather_result, dict) else {}
+            if "daily" in display_weather:
+                # Remove the bulky daily data arrays to make the output cleaner
+                del display_weather["daily"]
+
+            print("\n===== Historical Weather Data =====")
+            print(format_json(display_weather))
+
+        if fetch_soilgrids and show_raw:
+            print("\n===== ISRIC SoilGrids API Result =====")
+            print(format_json(soilgrids_result))
+
+        if fetch_openepi and show_raw:
+            print("\n===== OpenEPI Soil Type API Result =====")
+            print(format_json(openepi_result))
+
+        if fetch_soil_properties and show_raw:
+            print("\n===== OpenEPI Soil Properties API Result =====")
+            print(format_json(soil_properties_result))
+
+        if fetch_elevation and show_raw:
+            print("\n===== Open-Elevation API Result =====")
+            print(format_json(elevation_result))
+
+        if fetch_topo and show_raw:
+            print("\n===== Open-Meteo Topographic API Result =====")
+            print(format_json(topo_result))
+
+        if fetch_forest and show_raw:
+            print("\n===== Global Forest Watch API Result =====")
+            print(format_json(forest_result))
+
+        if fetch_trees and show_raw:
+            print("\n===== Tree Species Data =====")
+            print(format_json(tree_species_result))
+
         # Generate and output LLM prompt by default or if requested
-        if args.prompt or use_defaults:
+        if generate_prompt:
             prompt = PromptGenerator.generate_llm_prompt(
                 openepi_data=openepi_result, 
                 soilgrids_data=soilgrids_result,
@@ -179,6 +331,8 @@ def main() -> None:
         # Generate an interactive map if requested
         if args.map and not args.grid:  # Only generate individual maps if not grid mode
             try:
+                from shroomie.utils.map_generator import MapGenerator
+
                 # Generate the map with soil property data if available
                 map_file = MapGenerator.generate_map(
                     lat=lat,
@@ -200,6 +354,8 @@ def main() -> None:
     # Generate a combined map with all grid points if requested
     if args.map and args.grid:
         try:
+            from shroomie.utils.map_generator import MapGenerator
+
             # Generate grid map with all points
             grid_map_output = "grid_" + args.map_output
             MapGenerator.generate_grid_map(
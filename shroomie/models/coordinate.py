@@ -1,9 +1,21 @@
 #!/usr/bin/env python3
+import re
 from typing import Tuple, Optional
 
+# Compiled once: degrees are required, minutes/seconds optional, direction
+# letter mandatory (e.g. 45°05'55.9"N)
+_DMS_PATTERN = re.compile(
+    r"^\s*(?P<degrees>\d+(?:\.\d+)?)°\s*"
+    r"(?:(?P<minutes>\d+(?:\.\d+)?)')?\s*"
+    r"(?:(?P<seconds>\d+(?:\.\d+)?)\")?\s*"
+    r"(?P<direction>[NSEW])\s*$"
+)
+
 class Coordinate:
     """Class for handling geographic coordinates and conversions."""
-    
+
+    __slots__ = ("lat", "lon")
+
     def __init__(self, lat: float, lon: float):
         """Initialize with latitude and longitude in decimal degrees."""
         self.lat = lat
@@ -36,28 +48,21 @@ class Coordinate:
         Returns:
             float: Coordinate in decimal degrees
         """
-        # Get the direction (last character)
-        direction = dms[-1]
-        
-        # Extract degrees, minutes, seconds
-        parts = dms[:-1].replace('"', '').split('°')
-        degrees = float(parts[0])
-        
-        minutes_parts = parts[1].split("'")
-        minutes = float(minutes_parts[0])
-        
-        if len(minutes_parts) > 1:
-            seconds = float(minutes_parts[1])
-        else:
-            seconds = 0
-            
+        match = _DMS_PATTERN.match(dms)
+        if not match:
+            raise ValueError(f"Invalid DMS coordinate: {dms!r}")
+
+        degrees = float(match.group("degrees"))
+        minutes = float(match.group("minutes") or 0)
+        seconds = float(match.group("seconds") or 0)
+
         # Convert to decimal degrees
         decimal = degrees + minutes/60 + seconds/3600
-        
+
         # Apply negative value for South or West
-        if direction in ['S', 'W']:
+        if match.group("direction") in ("S", "W"):
             decimal = -decimal
-            
+
         return decimal
     
     def to_dms(self) -> Tuple[str, str]:
@@ -86,6 +91,45 @@ class Coordinate:
         
         return lat_dms, lon_dms
     
+    @staticmethod
+    def batch_to_dms(coordinates) -> list:
+        """
+        Convert many (lat, lon) pairs to DMS strings at once.
+
+        The degree/minute/second decomposition runs as vectorized NumPy
+        passes over the whole batch (useful for grid analyses), with only
+        the final string formatting per element.
+
+        Args:
+            coordinates: Sequence of (lat, lon) pairs
+
+        Returns:
+            list: (latitude_dms, longitude_dms) string tuples, matching
+                  Coordinate.to_dms for each pair
+        """
+        import numpy as np
+
+        coords = np.asarray(coordinates, dtype=np.float64)
+        if coords.size == 0:
+            return []
+
+        values = np.abs(coords)
+        degrees = values.astype(int)
+        minutes_full = (values - degrees) * 60
+        minutes = minutes_full.astype(int)
+        seconds = (minutes_full - minutes) * 60
+
+        lat_directions = np.where(coords[:, 0] >= 0, "N", "S")
+        lon_directions = np.where(coords[:, 1] >= 0, "E", "W")
+
+        return [
+            (
+                f"{degrees[i, 0]}°{minutes[i, 0]}'{seconds[i, 0]:.1f}\"{lat_directions[i]}",
+                f"{degrees[i, 1]}°{minutes[i, 1]}'{seconds[i, 1]:.1f}\"{lon_directions[i]}",
+            )
+            for i in range(len(coords))
+        ]
+
     def __str__(self) -> str:
         """String representation of the coordinate."""
         return f"({self.lat}, {self.lon})"
@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
+from operator import itemgetter
 from typing import Dict, Any, List, Optional, Union
 from dataclasses import dataclass
 
-@dataclass
+# Preparsers for the fixed-shape rows in the API payloads
+_soilgrids_row = itemgetter(0, 1)  # [name, probability] pairs
+_openepi_row = itemgetter("soil_type", "probability")
+
+@dataclass(slots=True, frozen=True)
 class SoilType:
     """Class representing a soil type with probability."""
     name: str
@@ -11,7 +16,7 @@ class SoilType:
     def __str__(self) -> str:
         return f"{self.name}: {self.probability}%"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SoilPropertyValue:
     """Class representing a soil property value at a specific depth."""
     depth: str  # e.g., "0-5cm"
@@ -28,7 +33,14 @@ class SoilPropertyValue:
 
 class SoilData:
     """Class for organizing and processing soil data from various APIs."""
-    
+
+    # Fixed attribute set: __slots__ drops the per-instance __dict__, which
+    # matters when a grid analysis materializes one SoilData per point
+    __slots__ = (
+        "lat", "lon", "soilgrids_data", "openepi_data", "soil_properties_data",
+        "primary_soil_type", "soil_types", "soil_properties",
+    )
+
     def __init__(self, 
                 lat: float, 
                 lon: float, 
@@ -52,75 +64,73 @@ class SoilData:
     
     def _process_data(self) -> None:
         """Process the raw API data into structured properties."""
-        # Process SoilGrids data
         if self.soilgrids_data and "error" not in self.soilgrids_data:
-            try:
-                # Get primary soil type
-                self.primary_soil_type = self.soilgrids_data.get("wrb_class_name")
-                
-                # Get soil type probabilities
-                if "wrb_class_probability" in self.soilgrids_data:
-                    for soil_data in self.soilgrids_data["wrb_class_probability"]:
-                        soil_type = SoilType(
-                            name=soil_data[0],
-                            probability=soil_data[1]
-                        )
-                        self.soil_types.append(soil_type)
-            except (KeyError, TypeError):
-                pass
-        
-        # Process OpenEPI data
+            self._process_soilgrids(self.soilgrids_data)
+
         if self.openepi_data and "error" not in self.openepi_data:
-            try:
-                if not self.primary_soil_type and "properties" in self.openepi_data:
-                    self.primary_soil_type = self.openepi_data["properties"].get("most_probable_soil_type")
-                
-                # Add soil type probabilities if available
-                if "properties" in self.openepi_data and "probabilities" in self.openepi_data["properties"]:
-                    for soil in self.openepi_data["properties"]["probabilities"]:
-                        soil_type = SoilType(
-                            name=soil['soil_type'],
-                            probability=soil['probability']
-                        )
-                        self.soil_types.append(soil_type)
-            except (KeyError, TypeError):
-                pass
-        
-        # Process soil properties data
+            self._process_openepi(self.openepi_data)
+
         if self.soil_properties_data and "error" not in self.soil_properties_data:
-            try:
-                if "properties" in self.soil_properties_data and "layers" in self.soil_properties_data["properties"]:
-                    layers = self.soil_properties_data["properties"]["layers"]
-                    
-                    for layer in layers:
-                        property_name = layer.get("name", layer.get("code", "Unknown"))
-                        unit = layer.get("unit_measure", {}).get("target_units", "")
-                        
-                        # Process depths
-                        if "depths" in layer:
-                            for depth in layer["depths"]:
-                                depth_label = depth.get("label", "Unknown depth")
-                                
-                                if "values" in depth:
-                                    # Convert values if needed
-                                    conversion = layer.get("unit_measure", {}).get("conversion_factor", 1)
-                                    values = {}
-                                    
-                                    for stat, value in depth["values"].items():
-                                        if conversion != 1:
-                                            values[stat] = value / conversion
-                                        else:
-                                            values[stat] = value
-                                    
-                                    soil_property = SoilPropertyValue(
-                                        depth=depth_label,
-                                        property_name=property_name,
-                                        values=values,
-                                        unit=unit
-                                    )
-                                    self.soil_properties.append(soil_property)
-            except (KeyError, TypeError):
-                pass
+            self._process_soil_properties(self.soil_properties_data)
+
+    def _process_soilgrids(self, data: Dict[str, Any]) -> None:
+        """Extract the primary soil type and ranked types from SoilGrids data."""
+        try:
+            self.primary_soil_type = data.get("wrb_class_name")
+
+            for row in data.get("wrb_class_probability", ()):
+                name, probability = _soilgrids_row(row)
+                self.soil_types.append(SoilType(name=name, probability=probability))
+        except (KeyError, IndexError, TypeError):
+            pass
+
+    def _process_openepi(self, data: Dict[str, Any]) -> None:
+        """Extract soil type information from OpenEPI data."""
+        try:
+            # Resolve the nested container once instead of re-walking the
+            # chain per field
+            properties = data.get("properties")
+            if not properties:
+                return
+
+            if not self.primary_soil_type:
+                self.primary_soil_type = properties.get("most_probable_soil_type")
+
+            for row in properties.get("probabilities", ()):
+                name, probability = _openepi_row(row)
+                self.soil_types.append(SoilType(name=name, probability=probability))
+        except (KeyError, TypeError):
+            pass
+
+    def _process_soil_properties(self, data: Dict[str, Any]) -> None:
+        """Extract per-depth property values from OpenEPI soil property data."""
+        try:
+            layers = data.get("properties", {}).get("layers", ())
+
+            for layer in layers:
+                property_name = layer.get("name", layer.get("code", "Unknown"))
+                unit_measure = layer.get("unit_measure", {})
+                unit = unit_measure.get("target_units", "")
+                conversion = unit_measure.get("conversion_factor", 1)
+
+                for depth in layer.get("depths", ()):
+                    raw_values = depth.get("values")
+                    if not raw_values:
+                        continue
+
+                    if conversion != 1:
+                        values = {stat: value / conversion for stat, value in raw_values.items()}
+                    else:
+                        values = dict(raw_values)
+
+                    self.soil_properties.append(SoilPropertyValue(
+                        depth=depth.get("label", "Unknown depth"),
+                        property_name=property_name,
+                        values=values,
+                        unit=unit
+                    ))
+        except (KeyError, TypeError):
+            pass
     
     def get_primary_soil_type(self) -> str:
         """Get the primary soil type or 'Unknown' if not available."""
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Small SQLite-backed key-value cache with TTL semantics."""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+
+class DiskCache:
+    """Persists JSON-serializable cache entries across process restarts.
+
+    Entries are stored in a single SQLite table keyed by string, with a
+    stored_at timestamp used to expire them lazily on read. Connections are
+    kept per-thread because sqlite3 connections are not thread-safe.
+    """
+
+    def __init__(self, path: str, ttl: int = 86400):
+        """
+        Args:
+            path (str): Filesystem path of the SQLite database file
+            ttl (int): Seconds an entry stays valid after being written
+        """
+        self._path = path
+        self._ttl = ttl
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get (or create) this thread's connection, creating the table."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self._path)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+            conn.commit()
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if absent or expired."""
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, stored_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, stored_at = row
+            if time.time() - stored_at > self._ttl:
+                conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                conn.commit()
+                return None
+
+            return json.loads(value)
+        except (sqlite3.Error, ValueError):
+            # A broken cache file should degrade to a miss, not an error
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value under key."""
+        try:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time())
+            )
+            conn.commit()
+        except (sqlite3.Error, TypeError, ValueError):
+            # Persistence is best-effort; the in-memory caches still work
+            pass
@@ -2,22 +2,25 @@
 import math
 from typing import List, Tuple
 
+import numpy as np
+
 class GridUtils:
     """Utilities for grid-based coordinate calculations."""
-    
+
     @staticmethod
     def calculate_grid_coordinates(center_lat: float, center_lon: float, grid_size: int = 3, distance_miles: float = 1.0) -> List[Tuple[float, float]]:
         """
         Calculate coordinates for a grid around a center point.
-        
+
         Args:
             center_lat (float): Latitude of the center point
             center_lon (float): Longitude of the center point
             grid_size (int): Size of the grid (e.g., 3 for a 3x3 grid)
             distance_miles (float): Distance between points in miles
-            
+
         Returns:
-            list: List of (lat, lon) coordinate tuples for the grid
+            list: List of (lat, lon) coordinate tuples for the grid,
+                  in row-major order from the top-left corner
         """
         # Convert miles to approximate degrees
         # These are rough approximations that work for most latitudes
@@ -25,18 +28,28 @@ class GridUtils:
         # 1 degree of longitude varies with latitude, roughly cos(lat) * 69 miles
         lat_offset = distance_miles / 69.0
         lon_offset = distance_miles / (69.0 * abs(math.cos(math.radians(center_lat))))
-        
-        # Calculate the starting point (top-left corner of the grid)
+
+        # Generate all rows and columns at once instead of a Python double loop
         half_size = (grid_size - 1) / 2
-        start_lat = center_lat + (half_size * lat_offset)
-        start_lon = center_lon - (half_size * lon_offset)
-        
-        # Generate the grid coordinates
-        coordinates = []
-        for i in range(grid_size):
-            for j in range(grid_size):
-                lat = start_lat - (i * lat_offset)
-                lon = start_lon + (j * lon_offset)
-                coordinates.append((lat, lon))
-        
-        return coordinates
\ No newline at end of file
+        steps = np.arange(grid_size)
+        lats = center_lat + (half_size - steps) * lat_offset
+        lons = center_lon + (steps - half_size) * lon_offset
+
+        grid_lat, grid_lon = np.meshgrid(lats, lons, indexing="ij")
+        return list(zip(grid_lat.ravel().tolist(), grid_lon.ravel().tolist()))
+
+    @staticmethod
+    def calculate_grid_bounds(coordinates: List[Tuple[float, float]]) -> Tuple[float, float, float, float]:
+        """
+        Calculate the bounding box of a list of grid coordinates.
+
+        Args:
+            coordinates (list): List of (lat, lon) coordinate tuples
+
+        Returns:
+            tuple: (min_lat, max_lat, min_lon, max_lon)
+        """
+        coords_array = np.asarray(coordinates)
+        min_lat, min_lon = coords_array.min(axis=0)
+        max_lat, max_lon = coords_array.max(axis=0)
+        return float(min_lat), float(max_lat), float(min_lon), float(max_lon)
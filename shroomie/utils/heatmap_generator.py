@@ -199,24 +199,28 @@ class HeatmapGenerator:
 
         color = HeatmapGenerator.create_color_gradient(score)
 
-        # Create popup text
-        popup_html = f"""
+        # Create popup text, joining the pieces once instead of building
+        # intermediate strings with +=
+        popup_parts = [f"""
         <div style="font-family: Arial; min-width: 200px;">
             <h4 style="margin: 0 0 10px 0;">{species_name}</h4>
             <p style="margin: 5px 0;"><strong>Suitability Score:</strong> {score:.1f}/100</p>
             <p style="margin: 5px 0;"><strong>Coordinates:</strong> {lat:.4f}, {lon:.4f}</p>
-        """
+        """]
 
         if popup_data:
             if popup_data.get('elevation'):
-                popup_html += f"<p style='margin: 5px 0;'><strong>Elevation:</strong> {popup_data['elevation']}m</p>"
+                popup_parts.append(f"<p style='margin: 5px 0;'><strong>Elevation:</strong> {popup_data['elevation']}m</p>")
             if popup_data.get('factors'):
-                popup_html += "<p style='margin: 5px 0;'><strong>Top Factors:</strong></p><ul style='margin: 5px 0; padding-left: 20px;'>"
-                for factor, factor_score in list(popup_data['factors'].items())[:3]:
-                    popup_html += f"<li>{factor}: {factor_score:.0f}</li>"
-                popup_html += "</ul>"
-
-        popup_html += "</div>"
+                popup_parts.append("<p style='margin: 5px 0;'><strong>Top Factors:</strong></p><ul style='margin: 5px 0; padding-left: 20px;'>")
+                popup_parts.extend(
+                    f"<li>{factor}: {factor_score:.0f}</li>"
+                    for factor, factor_score in list(popup_data['factors'].items())[:3]
+                )
+                popup_parts.append("</ul>")
+
+        popup_parts.append("</div>")
+        popup_html = "".join(popup_parts)
 
         return folium.CircleMarker(
             location=[lat, lon],
@@ -1,6 +1,27 @@
 #!/usr/bin/env python3
 from typing import Dict, Any, List, Optional, Union, Tuple
 
+import jinja2
+
+from shroomie.utils.grid_utils import GridUtils
+
+# Compiled once at module scope so each map render only pays for filling in
+# values, not re-parsing the template. autoescape guards the API-sourced
+# property names and labels.
+_SOIL_POPUP_TEMPLATE = jinja2.Template(
+    "Coordinates: {{ lat }}, {{ lon }}"
+    "{% if layers is not none %}<br><b>Soil Properties:</b><br>"
+    "{% for layer in layers %}"
+    "<br><b>{{ layer.name }}</b>{% if layer.unit %} ({{ layer.unit }}){% endif %}:<br>"
+    "{% for depth in layer.depths %}"
+    "&nbsp;&nbsp;{{ depth.label }}: {{ depth.values_text }}<br>"
+    "{% endfor %}"
+    "{% endfor %}"
+    "{% if error %}<br>Error processing soil data: {{ error }}<br>{% endif %}"
+    "{% endif %}",
+    autoescape=True
+)
+
 class MapGenerator:
     """Generates interactive maps for visualization."""
     
@@ -29,46 +50,43 @@ class MapGenerator:
         # Create a map centered at the coordinates
         my_map = folium.Map(location=[lat, lon], zoom_start=zoom)
         
-        # Prepare popup content
-        popup_content = f"Coordinates: {lat}, {lon}"
-        
-        # Add soil data to popup if available
+        # Reshape the soil data for the compiled popup template
+        layers_data = None
+        popup_error = None
         if include_soil_data and "error" not in include_soil_data:
-            popup_content += "<br><b>Soil Properties:</b><br>"
-            
+            layers_data = []
             try:
-                if "properties" in include_soil_data and "layers" in include_soil_data["properties"]:
-                    layers = include_soil_data["properties"]["layers"]
-                    
-                    for layer in layers:
-                        property_name = layer.get("name", layer.get("code", "Unknown"))
-                        unit = layer.get("unit_measure", {}).get("target_units", "")
-                        conversion = layer.get("unit_measure", {}).get("conversion_factor", 1)
-                        
-                        popup_content += f"<br><b>{property_name}</b>"
-                        if unit:
-                            popup_content += f" ({unit})"
-                        popup_content += ":<br>"
-                        
-                        if "depths" in layer:
-                            for depth in layer["depths"]:
-                                depth_label = depth.get("label", "Unknown depth")
-                                popup_content += f"&nbsp;&nbsp;{depth_label}: "
-                                
-                                if "values" in depth:
-                                    values_str = []
-                                    for stat, value in depth["values"].items():
-                                        # Apply conversion factor if available
-                                        if conversion != 1:
-                                            converted_value = value / conversion
-                                            values_str.append(f"{stat}={converted_value:.1f}")
-                                        else:
-                                            values_str.append(f"{stat}={value}")
-                                    
-                                    popup_content += ", ".join(values_str)
-                                popup_content += "<br>"
+                for layer in include_soil_data.get("properties", {}).get("layers", []):
+                    conversion = layer.get("unit_measure", {}).get("conversion_factor", 1)
+
+                    depths = []
+                    for depth in layer.get("depths", []):
+                        values_str = []
+                        for stat, value in depth.get("values", {}).items():
+                            # Apply conversion factor if available
+                            if conversion != 1:
+                                values_str.append(f"{stat}={value / conversion:.1f}")
+                            else:
+                                values_str.append(f"{stat}={value}")
+
+                        # Named values_text because "values" would resolve to
+                        # dict.values in Jinja attribute lookup
+                        depths.append({
+                            "label": depth.get("label", "Unknown depth"),
+                            "values_text": ", ".join(values_str)
+                        })
+
+                    layers_data.append({
+                        "name": layer.get("name", layer.get("code", "Unknown")),
+                        "unit": layer.get("unit_measure", {}).get("target_units", ""),
+                        "depths": depths
+                    })
             except Exception as e:
-                popup_content += f"<br>Error processing soil data: {str(e)}<br>"
+                popup_error = str(e)
+
+        popup_content = _SOIL_POPUP_TEMPLATE.render(
+            lat=lat, lon=lon, layers=layers_data, error=popup_error
+        )
         
         # Add a marker at the coordinates with the popup
         folium.Marker(
@@ -108,62 +126,28 @@ class MapGenerator:
         
         # Create a map centered at the original coordinates
         my_map = folium.Map(location=[center_lat, center_lon], zoom_start=zoom)
-        
-        # Organize grid points and find boundaries
-        grid_points = {}
-        min_lat = float('inf')
-        max_lat = float('-inf')
-        min_lon = float('inf')
-        max_lon = float('-inf')
-        
-        # Group coordinates into a 2D grid structure for easier line drawing
-        point_idx = 0
-        for i in range(grid_size):
-            for j in range(grid_size):
-                lat, lon = coordinates[point_idx]
-                if (i, j) not in grid_points:
-                    grid_points[(i, j)] = (lat, lon)
-                
-                # Track boundaries
-                min_lat = min(min_lat, lat)
-                max_lat = max(max_lat, lat)
-                min_lon = min(min_lon, lon)
-                max_lon = max(max_lon, lon)
-                
-                point_idx += 1
-        
-        # Add grid lines
-        # Horizontal lines
-        for i in range(grid_size):
-            points = []
-            for j in range(grid_size):
-                lat, lon = grid_points[(i, j)]
-                points.append([lat, lon])
-            
-            # Create a polyline for this row
-            folium.PolyLine(
-                locations=points,
-                color="blue",
-                weight=2,
-                opacity=0.7,
-                dash_array="5, 5"
-            ).add_to(my_map)
-        
-        # Vertical lines
-        for j in range(grid_size):
-            points = []
-            for i in range(grid_size):
-                lat, lon = grid_points[(i, j)]
-                points.append([lat, lon])
-            
-            # Create a polyline for this column
-            folium.PolyLine(
-                locations=points,
-                color="blue",
-                weight=2,
-                opacity=0.7,
-                dash_array="5, 5"
-            ).add_to(my_map)
+
+        # Find the grid boundaries
+        min_lat, max_lat, min_lon, max_lon = GridUtils.calculate_grid_bounds(coordinates)
+
+        # Add all grid rows and columns as one multi-segment PolyLine
+        # instead of a separate vector layer per line. The coordinates list
+        # is row-major, so rows are contiguous slices and columns are
+        # strided slices.
+        line_segments = [
+            coordinates[i * grid_size:(i + 1) * grid_size]
+            for i in range(grid_size)
+        ] + [
+            coordinates[j::grid_size]
+            for j in range(grid_size)
+        ]
+        folium.PolyLine(
+            locations=line_segments,
+            color="blue",
+            weight=2,
+            opacity=0.7,
+            dash_array="5, 5"
+        ).add_to(my_map)
         
         # Add outline around the entire grid
         boundary_points = [
@@ -181,11 +165,12 @@ class MapGenerator:
         ).add_to(my_map)
         
         # Add markers for all grid points
+        center_idx = len(coordinates) // 2  # Center point in the grid
         for idx, (lat, lon) in enumerate(coordinates):
             popup_content = f"Point {idx+1}: {lat}, {lon}"
-            
+
             # Make the center point a different color
-            if idx == len(coordinates) // 2:  # Center point in the grid
+            if idx == center_idx:
                 folium.Marker(
                     location=[lat, lon],
                     popup=popup_content,